@@ -0,0 +1,50 @@
+"""listing keyset indexes
+
+Revision ID: 4c8e2f91a6d7
+Revises: b7d25e0f3c18
+Create Date: 2026-10-18 15:42:10.318204
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "4c8e2f91a6d7"
+down_revision: Union[str, Sequence[str], None] = "b7d25e0f3c18"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table("orders", schema=None) as batch_op:
+        batch_op.create_index(
+            "ix_orders_jar_id_timestamp_id",
+            ["jar_id", "timestamp", "id"],
+            unique=False,
+        )
+        batch_op.create_index(
+            "ix_orders_status_timestamp_id",
+            ["status", "timestamp", "id"],
+            unique=False,
+        )
+
+    with op.batch_alter_table("payments", schema=None) as batch_op:
+        batch_op.create_index(
+            "ix_payments_jar_id_time_id", ["jar_id", "time", "id"], unique=False
+        )
+        batch_op.create_index("ix_payments_time_id", ["time", "id"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("payments", schema=None) as batch_op:
+        batch_op.drop_index("ix_payments_time_id")
+        batch_op.drop_index("ix_payments_jar_id_time_id")
+
+    with op.batch_alter_table("orders", schema=None) as batch_op:
+        batch_op.drop_index("ix_orders_status_timestamp_id")
+        batch_op.drop_index("ix_orders_jar_id_timestamp_id")
@@ -0,0 +1,75 @@
+"""unique monobank transaction id
+
+Revision ID: 5b0e7c2a91d4
+Revises: 711d9eea31b5
+Create Date: 2026-10-18 10:12:41.318204
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5b0e7c2a91d4"
+down_revision: Union[str, Sequence[str], None] = "711d9eea31b5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Дублікат, прив'язаний до іншого замовлення, видалити не можна: те замовлення
+    # втратило б оплату. Такі транзакції треба розібрати вручну до міграції.
+    conflicts = (
+        op.get_bind()
+        .execute(
+            sa.text(
+                """
+                SELECT monobank_transaction_id
+                FROM payments
+                WHERE order_id IS NOT NULL
+                GROUP BY monobank_transaction_id
+                HAVING COUNT(DISTINCT order_id) > 1
+                """
+            )
+        )
+        .scalars()
+        .all()
+    )
+    if conflicts:
+        raise RuntimeError(
+            "Duplicate Monobank transactions are linked to different orders, "
+            f"resolve them before upgrading: {', '.join(conflicts)}"
+        )
+
+    # Прибрати дублікати, що могли з'явитися через гонку check-then-insert.
+    # Залишається запис, прив'язаний до замовлення, або найстаріший.
+    op.execute(
+        sa.text(
+            """
+            DELETE FROM payments
+            WHERE id NOT IN (
+                SELECT COALESCE(
+                    MIN(CASE WHEN order_id IS NOT NULL THEN id END), MIN(id)
+                )
+                FROM payments
+                GROUP BY monobank_transaction_id
+            )
+            """
+        )
+    )
+    with op.batch_alter_table("payments", schema=None) as batch_op:
+        batch_op.create_index(
+            batch_op.f("ix_payments_monobank_transaction_id"),
+            ["monobank_transaction_id"],
+            unique=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("payments", schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f("ix_payments_monobank_transaction_id"))
@@ -0,0 +1,47 @@
+"""jar polling tables
+
+Revision ID: 9f4c1d7be2a3
+Revises: e3a8d41f7c60
+Create Date: 2026-10-18 12:20:05.551870
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9f4c1d7be2a3"
+down_revision: Union[str, Sequence[str], None] = "e3a8d41f7c60"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "jars",
+        sa.Column("jar_id", sa.String(length=100), nullable=False),
+        sa.Column("monobank_token", sa.String(length=100), nullable=False),
+        sa.Column("polled_at", sa.Float(), nullable=True),
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("jar_id"),
+    )
+    op.create_table(
+        "jarsyncstates",
+        sa.Column("jar_id", sa.String(length=100), nullable=False),
+        sa.Column("last_seen_time", sa.BigInteger(), nullable=True),
+        sa.Column("synced_at", sa.Float(), nullable=True),
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("jar_id"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("jarsyncstates")
+    op.drop_table("jars")
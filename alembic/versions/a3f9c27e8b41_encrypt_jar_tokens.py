@@ -0,0 +1,66 @@
+"""encrypt jar tokens
+
+Revision ID: a3f9c27e8b41
+Revises: 4c8e2f91a6d7
+Create Date: 2026-10-18 18:20:44.512930
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from core.token_cipher import token_cipher
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a3f9c27e8b41"
+down_revision: Union[str, Sequence[str], None] = "4c8e2f91a6d7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+jars = sa.table(
+    "jars",
+    sa.column("id", sa.Integer),
+    sa.column("monobank_token", sa.String),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table("jars", schema=None) as batch_op:
+        batch_op.alter_column(
+            "monobank_token",
+            existing_type=sa.String(length=100),
+            type_=sa.String(length=512),
+            existing_nullable=False,
+        )
+
+    # Токени, збережені відкритим текстом, шифруються ключем MONOBANK_TOKEN_KEY
+    connection = op.get_bind()
+    for row in connection.execute(sa.select(jars.c.id, jars.c.monobank_token)).all():
+        connection.execute(
+            jars.update()
+            .where(jars.c.id == row.id)
+            .values(monobank_token=token_cipher.encrypt(row.monobank_token))
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    connection = op.get_bind()
+    for row in connection.execute(sa.select(jars.c.id, jars.c.monobank_token)).all():
+        connection.execute(
+            jars.update()
+            .where(jars.c.id == row.id)
+            .values(monobank_token=token_cipher.decrypt(row.monobank_token))
+        )
+
+    with op.batch_alter_table("jars", schema=None) as batch_op:
+        batch_op.alter_column(
+            "monobank_token",
+            existing_type=sa.String(length=512),
+            type_=sa.String(length=100),
+            existing_nullable=False,
+        )
@@ -0,0 +1,39 @@
+"""backfill jobs
+
+Revision ID: b7d25e0f3c18
+Revises: 9f4c1d7be2a3
+Create Date: 2026-10-18 13:41:52.120934
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b7d25e0f3c18"
+down_revision: Union[str, Sequence[str], None] = "9f4c1d7be2a3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "backfilljobs",
+        sa.Column("jar_id", sa.String(length=100), nullable=False),
+        sa.Column("from_time", sa.BigInteger(), nullable=False),
+        sa.Column("to_time", sa.BigInteger(), nullable=False),
+        sa.Column("completed_until", sa.BigInteger(), nullable=False),
+        sa.Column("finished", sa.Boolean(), nullable=False),
+        sa.Column("updated_at", sa.Float(), nullable=True),
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("backfilljobs")
@@ -0,0 +1,45 @@
+"""integer payment time
+
+Revision ID: c2d7e5a0f913
+Revises: a3f9c27e8b41
+Create Date: 2026-10-18 21:07:36.204518
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c2d7e5a0f913"
+down_revision: Union[str, Sequence[str], None] = "a3f9c27e8b41"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Рядкове порівняння часу збігалося з числовим лише для 10-значних значень;
+    # індекси ix_payments_*_time_id перебудовуються разом із колонкою
+    with op.batch_alter_table("payments", schema=None) as batch_op:
+        batch_op.alter_column(
+            "time",
+            existing_type=sa.String(),
+            type_=sa.BigInteger(),
+            existing_nullable=True,
+            postgresql_using="time::numeric::bigint",
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("payments", schema=None) as batch_op:
+        batch_op.alter_column(
+            "time",
+            existing_type=sa.BigInteger(),
+            type_=sa.String(),
+            existing_nullable=True,
+            postgresql_using="time::text",
+        )
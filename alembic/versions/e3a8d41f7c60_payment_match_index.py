@@ -0,0 +1,35 @@
+"""payment match index
+
+Revision ID: e3a8d41f7c60
+Revises: 5b0e7c2a91d4
+Create Date: 2026-10-18 11:03:27.904117
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e3a8d41f7c60"
+down_revision: Union[str, Sequence[str], None] = "5b0e7c2a91d4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table("payments", schema=None) as batch_op:
+        batch_op.create_index(
+            "ix_payments_jar_id_amount_comment",
+            ["jar_id", "amount", "comment"],
+            unique=False,
+            postgresql_include=["id", "order_id", "time"],
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("payments", schema=None) as batch_op:
+        batch_op.drop_index("ix_payments_jar_id_amount_comment")
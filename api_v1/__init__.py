@@ -6,7 +6,9 @@ from api_v1.system.views import admin_router
 
 
 from api_v1.order.views import router as order_router
+from api_v1.order.views import ws_router as order_ws_router
 from api_v1.payment.views import router as payment_router
+from api_v1.payment.views import webhook_router
 from api_v1.auth.view import router as auth_router
 
 router = APIRouter()
@@ -15,4 +17,6 @@ router.include_router(account_router)
 router.include_router(admin_router)
 router.include_router(permission_router)
 router.include_router(order_router)
+router.include_router(order_ws_router)
 router.include_router(payment_router)
+router.include_router(webhook_router)
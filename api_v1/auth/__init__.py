@@ -1,7 +1,19 @@
-from .helper import get_current_admin, authenticate_admin, auth_by_operation_token
+from .helper import (
+    get_current_admin,
+    get_current_admin_claims,
+    AdminClaims,
+    authenticate_admin,
+    auth_by_operation_token,
+    auth_by_webhook_secret,
+    websocket_has_operation_token,
+)
 
 __all__ = [
     "get_current_admin",
+    "get_current_admin_claims",
+    "AdminClaims",
     "authenticate_admin",
     "auth_by_operation_token",
+    "auth_by_webhook_secret",
+    "websocket_has_operation_token",
 ]
@@ -1,5 +1,5 @@
-import bcrypt
-from fastapi import Form, HTTPException, status, Depends, Security
+from pydantic import BaseModel
+from fastapi import Form, HTTPException, status, Depends, Security, Query, WebSocket
 from fastapi.security import (
     OAuth2PasswordBearer,
     APIKeyHeader,
@@ -9,25 +9,46 @@ from sqlalchemy.ext.asyncio import AsyncSession
 import jwt
 
 from core import Admin, db_helper
+from core.config import settings
+from core.enums import AdminPermission
+from core.password_pool import password_hasher
 from core.utils import decode_jwt
+from api_v1.system.dependencies import get_permission_set
+from api_v1.system.permission_cache import (
+    decode_permissions,
+    encode_permissions,
+    permission_cache,
+)
 from core.config import operation_token as OPERATION_TOKEN
+from core.config import webhook_secret as WEBHOOK_SECRET
 
 
 security = OAuth2PasswordBearer(tokenUrl="token")
 
 
+class AdminClaims(BaseModel):
+    """
+    Автентифікований адміністратор. `permissions` заповнені, лише якщо дозволи
+    взято з актуального токена (JWT_EMBED_PERMISSIONS=1), інакше вони читаються з кешу/БД.
+    """
+
+    id: int
+    user_name: str | None = None
+    permissions: frozenset[AdminPermission] | None = None
+
+
 async def validate_password(
     password: str,
     hashed_password: bytes,
 ) -> bool:
-    return bcrypt.checkpw(
+    return await password_hasher.check(
         password=password.encode(),
         hashed_password=hashed_password,
     )
 
 
 async def authenticate_admin(
-    session: AsyncSession = Depends(db_helper.scoped_session_dependency),
+    session: AsyncSession = Depends(db_helper.session_dependency),
     user_name: str = Form(None),
     username: str | None = Form(None),
     password: str = Form(...),
@@ -54,10 +75,7 @@ async def authenticate_admin(
     return admin
 
 
-async def get_current_admin(
-    token: str = Depends(security),
-    session: AsyncSession = Depends(db_helper.scoped_session_dependency),
-) -> Admin:
+async def decode_access_token(token: str) -> dict:
     try:
         payload = await decode_jwt(token)
     except jwt.ExpiredSignatureError:
@@ -81,6 +99,12 @@ async def get_current_admin(
             detail="Invalid token payload",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    return payload
+
+
+async def load_admin_by_payload(payload: dict, session: AsyncSession) -> Admin:
+    admin_id = payload.get("sub")
+    user_name = payload.get("user_name")
 
     query = select(Admin)
     if admin_id:
@@ -99,6 +123,53 @@ async def get_current_admin(
     return admin
 
 
+async def get_current_admin(
+    token: str = Depends(security),
+    session: AsyncSession = Depends(db_helper.session_dependency),
+) -> Admin:
+    payload = await decode_access_token(token)
+    return await load_admin_by_payload(payload, session)
+
+
+async def get_current_admin_claims(
+    token: str = Depends(security),
+    session: AsyncSession = Depends(db_helper.session_dependency),
+) -> AdminClaims:
+    """
+    Адміністратор для перевірки дозволів. Якщо токен містить актуальний claim `perm`,
+    авторизація виконується без запитів до БД; інакше адміністратор читається з БД.
+    """
+    payload = await decode_access_token(token)
+    mask = payload.get("perm")
+    admin_id = payload.get("sub")
+    if (
+        settings.jwt.embed_permissions
+        and mask is not None
+        and admin_id
+        and permission_cache.is_token_current(int(admin_id), payload.get("iat", 0))
+    ):
+        return AdminClaims(
+            id=int(admin_id),
+            user_name=payload.get("user_name"),
+            permissions=decode_permissions(mask),
+        )
+
+    admin = await load_admin_by_payload(payload, session)
+    return AdminClaims(id=admin.id, user_name=admin.user_name)
+
+
+async def build_token_payload(admin_id: int, user_name: str, session: AsyncSession):
+    """Вміст access-токена; з JWT_EMBED_PERMISSIONS=1 — разом з маскою дозволів"""
+    payload = {
+        "sub": str(admin_id),
+        "user_name": str(user_name),
+    }
+    if settings.jwt.embed_permissions:
+        permissions = await get_permission_set(admin_id=admin_id, session=session)
+        payload["perm"] = encode_permissions(permissions)
+    return payload
+
+
 # OpenAPI security scheme for operation token in header
 operation_api_key = APIKeyHeader(
     name="X-Operation-Token", auto_error=False, scheme_name="OperationToken"
@@ -131,3 +202,37 @@ async def auth_by_operation_token(token: str | None = Security(operation_api_key
         )
 
     return True
+
+
+def websocket_has_operation_token(websocket: WebSocket) -> bool:
+    """
+    Operation token for WebSocket connections. Browsers cannot set custom headers
+    on a WebSocket, so the token is also accepted as a query parameter:
+    - Header: X-Operation-Token: <OPERATION_TOKEN>
+    - or ?token=<OPERATION_TOKEN>
+    """
+    token = websocket.headers.get("X-Operation-Token") or websocket.query_params.get(
+        "token"
+    )
+    return bool(OPERATION_TOKEN) and token == OPERATION_TOKEN
+
+
+async def auth_by_webhook_secret(secret: str | None = Query(None)):
+    """
+    Validate the secret query parameter of the Monobank webhook URL.
+    Monobank cannot send custom headers, so the secret is a part of the registered URL:
+    - /payment/webhook?secret=<MONOBANK_WEBHOOK_SECRET>
+    """
+    if not WEBHOOK_SECRET:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Webhook secret not configured",
+        )
+
+    if secret != WEBHOOK_SECRET:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid webhook secret",
+        )
+
+    return True
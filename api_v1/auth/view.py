@@ -1,6 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from api_v1.auth.helper import authenticate_admin, get_current_admin
+from api_v1.auth.helper import (
+    authenticate_admin,
+    get_current_admin,
+    build_token_payload,
+)
+from core import db_helper
 from core.utils import encode_jwt, decode_jwt, encode_refresh_jwt
 from fastapi import Body
 
@@ -9,12 +15,18 @@ router = APIRouter(tags=["Auth"])
 
 
 @router.post("/token")
-async def token(admin=Depends(authenticate_admin)):
+async def token(
+    admin=Depends(authenticate_admin),
+    session: AsyncSession = Depends(db_helper.session_dependency),
+):
     payload = {
         "sub": str(admin.id),
         "user_name": str(admin.user_name),
     }
-    access_token = await encode_jwt(payload)
+    access_payload = await build_token_payload(
+        admin_id=admin.id, user_name=admin.user_name, session=session
+    )
+    access_token = await encode_jwt(access_payload)
     refresh_token = await encode_refresh_jwt(payload)
     return {
         "access_token": access_token,
@@ -33,7 +45,10 @@ async def get_me(admin=Depends(get_current_admin)):
 
 
 @router.post("/refresh")
-async def refresh_token_endpoint(refresh_token: str = Body(embed=True)):
+async def refresh_token_endpoint(
+    refresh_token: str = Body(embed=True),
+    session: AsyncSession = Depends(db_helper.session_dependency),
+):
     # Validate the refresh token and issue a new access token
     try:
         payload = await decode_jwt(refresh_token)
@@ -53,7 +68,14 @@ async def refresh_token_endpoint(refresh_token: str = Body(embed=True)):
         )
 
     new_payload = {"sub": sub, "user_name": user_name}
-    new_access_token = await encode_jwt(new_payload)
+    if sub:
+        # Дозволи перечитуються, тож оновлений токен враховує всі зміни
+        access_payload = await build_token_payload(
+            admin_id=int(sub), user_name=user_name, session=session
+        )
+    else:
+        access_payload = new_payload
+    new_access_token = await encode_jwt(access_payload)
     new_refresh_token = await encode_refresh_jwt(new_payload)
     return {
         "access_token": new_access_token,
@@ -0,0 +1,35 @@
+from api_v1.order.matcher import order_matcher
+from api_v1.order.notifier import order_notifier
+from api_v1.system.permission_cache import permission_cache
+from core.db_helper import db_helper
+from core.event_bus import (
+    EventBus,
+    ORDER_CREATED,
+    ORDER_DELETED,
+    ORDER_PAID,
+    ORDER_STATUS_CHANGED,
+    PERMISSION_CHANGED,
+    event_bus,
+)
+
+
+async def resync_local_state():
+    """Перебудувати стан процесу, якщо події шини могли бути пропущені"""
+    permission_cache.invalidate()
+    async with db_helper.session_factory() as session:
+        await order_matcher.rebuild(session)
+
+
+def register_event_handlers(bus: EventBus = event_bus):
+    """
+    Підписати внутрішньопроцесний стан на події шини. Викликається один раз
+    при старті кожного воркера.
+    """
+    for event_type in (ORDER_CREATED, ORDER_PAID, ORDER_STATUS_CHANGED, ORDER_DELETED):
+        bus.subscribe(event_type, order_matcher.apply_event)
+    for event_type in (ORDER_PAID, ORDER_STATUS_CHANGED, ORDER_DELETED):
+        bus.subscribe(event_type, order_notifier.publish)
+    bus.subscribe(
+        PERMISSION_CHANGED, lambda event: permission_cache.invalidate(event["admin_id"])
+    )
+    bus.on_resync(resync_local_state)
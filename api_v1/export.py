@@ -0,0 +1,132 @@
+"""
+Офлайн-вивантаження замовлень та транзакцій у колонкові файли Parquet або Arrow (IPC).
+
+    python -m api_v1.export payments --jar-id <jar_id> --from 2025-01-01 --to 2026-01-01 -o payments.parquet
+    python -m api_v1.export orders --status paid --format arrow -o orders.arrow
+
+Потрібен pyarrow (`pip install pyarrow`). Рядки читаються серверним курсором
+пачками й записуються як окремі record batch, тож пам'ять не залежить від розміру вивантаження.
+"""
+
+import argparse
+import asyncio
+import logging
+from datetime import datetime
+
+from api_v1.order.crud import export_orders_stmt, order_list_item
+from api_v1.payment.crud import export_payments_stmt, payment_list_item
+from core.db_helper import db_helper
+from core.export import iter_batches
+from core.models.order import OrderStatus
+
+logger = logging.getLogger(__name__)
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        raise SystemExit("pyarrow is required: pip install pyarrow")
+    return pyarrow
+
+
+def arrow_schema(table: str):
+    pa = _require_pyarrow()
+    if table == "payments":
+        return pa.schema(
+            [
+                ("id", pa.int64()),
+                ("jar_id", pa.string()),
+                ("order_id", pa.int64()),
+                ("monobank_transaction_id", pa.string()),
+                ("amount", pa.int64()),
+                ("comment", pa.string()),
+                ("time", pa.int64()),
+            ]
+        )
+    return pa.schema(
+        [
+            ("id", pa.int64()),
+            ("jar_id", pa.string()),
+            ("amount", pa.int64()),
+            ("comment", pa.string()),
+            ("status", pa.string()),
+            ("timestamp", pa.float64()),
+        ]
+    )
+
+
+async def export_table(
+    table: str, output: str, file_format: str = "parquet", **filters
+) -> int:
+    """
+    Записати вибірку у файл Parquet або Arrow.
+    :return: кількість записаних рядків
+    """
+    pa = _require_pyarrow()
+    if table == "payments":
+        stmt, serialize = export_payments_stmt(**filters), payment_list_item
+    else:
+        stmt, serialize = export_orders_stmt(**filters), order_list_item
+    schema = arrow_schema(table)
+
+    if file_format == "parquet":
+        import pyarrow.parquet as pq
+
+        writer = pq.ParquetWriter(output, schema, compression="zstd")
+    else:
+        writer = pa.ipc.new_file(output, schema)
+
+    rows = 0
+    try:
+        async for batch in iter_batches(stmt):
+            writer.write_batch(
+                pa.RecordBatch.from_pylist([serialize(row) for row in batch], schema)
+            )
+            rows += len(batch)
+            logger.info("Export %s: %d rows", table, rows)
+    finally:
+        writer.close()
+    return rows
+
+
+def _parse_time(value: str) -> int:
+    if value.isdigit():
+        return int(value)
+    return int(datetime.fromisoformat(value).timestamp())
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Вивантаження у Parquet/Arrow")
+    parser.add_argument("table", choices=["payments", "orders"])
+    parser.add_argument("-o", "--output", required=True)
+    parser.add_argument("--format", dest="file_format", choices=["parquet", "arrow"])
+    parser.add_argument("--jar-id")
+    parser.add_argument("--from", dest="time_from", type=_parse_time)
+    parser.add_argument("--to", dest="time_to", type=_parse_time)
+    parser.add_argument("--matched", choices=["yes", "no"], help="лише для payments")
+    parser.add_argument(
+        "--status", choices=[item.value for item in OrderStatus], help="лише для orders"
+    )
+    args = parser.parse_args()
+
+    file_format = args.file_format or (
+        "arrow" if args.output.endswith((".arrow", ".feather")) else "parquet"
+    )
+    filters = dict(jar_id=args.jar_id, time_from=args.time_from, time_to=args.time_to)
+    if args.table == "payments":
+        if args.matched is not None:
+            filters["matched"] = args.matched == "yes"
+    elif args.status is not None:
+        filters["order_status"] = OrderStatus(args.status)
+
+    logging.basicConfig(level=logging.INFO)
+    try:
+        rows = await export_table(args.table, args.output, file_format, **filters)
+    finally:
+        await db_helper.dispose()
+    print(f"{rows} rows -> {args.output}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,27 +1,40 @@
 from datetime import datetime
 
 from fastapi import HTTPException, status
-from sqlalchemy import select
+from sqlalchemy import select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from api_v1.order.dependencies import (
     connect_order_to_payment,
     change_order_status,
+    publish_order_status,
 )
+from api_v1.order.notifier import order_event
+from core.event_bus import ORDER_CREATED, ORDER_DELETED, event_bus
 from api_v1.payment.crud import search_payment
 
 from api_v1.order.schemas import (
     OrderCreate,
+    OrderConfirmResult,
 )
 from api_v1.payment.dependencies import return_payment_by_id
 from api_v1.payment.schemas import PaymentSearch
 from core.models.order import Order, OrderStatus
+from core.models.payment import Payment
+from core.pagination import keyset_page
 
 
 
 
-async def return_order_by_id(order_id: int, session: AsyncSession) -> Order:
+async def return_order_by_id(
+    order_id: int, session: AsyncSession, for_update: bool = False
+) -> Order:
+    """
+    :param for_update: заблокувати рядок замовлення (SELECT ... FOR UPDATE) до коміту
+    """
     stmt = select(Order).where(Order.id == order_id)
+    if for_update:
+        stmt = stmt.with_for_update()
     result = await session.execute(stmt)
     order = result.scalar_one_or_none()
     if order is None:
@@ -34,37 +47,190 @@ async def validate_order(
     session: AsyncSession,
     order: Order,
 ):
+    """
+    Підтвердження оплати замовлення в межах однієї транзакції бази даних.
+    Замовлення має бути отримане з for_update=True, а знайдена транзакція
+    блокується тут, тож паралельні підтвердження не прив'яжуть один платіж
+    до двох замовлень. Зміни фіксуються одним комітом unit of work.
+    """
 
     if order.status == OrderStatus.paid:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST, detail="Order is paid"
+        # Замовлення вже закрите автоматично під час отримання транзакції
+        return dict(
+            data=order,
+            status_code=status.HTTP_200_OK,
         )
 
+    # Лише транзакції після створення замовлення: старіша транзакція з тими ж
+    # даними не заступає придатну новішу (як і в validate_orders_batch)
     validation_approve = await search_payment(
         data=PaymentSearch(
             jar_id=order.jar_id, amount=order.amount, comment=order.comment
         ),
         session=session,
+        unclaimed_only=True,
+        for_update=True,
+        paid_after=order.timestamp,
     )
     transaction_data = await return_payment_by_id(
         transaction_id=validation_approve["id"], session=session
     )
-    if validation_approve:
-        if validation_approve["time"] > order.timestamp:
-            await change_order_status(
-                order=order, status_to_set=OrderStatus.paid, session=session
-            )
-            await connect_order_to_payment(order, transaction_data, session)
-            return dict(
-                data=order,
-                status_code=status.HTTP_200_OK,
+    await change_order_status(
+        order=order, status_to_set=OrderStatus.paid, session=session
+    )
+    await connect_order_to_payment(order, transaction_data, session)
+    return dict(
+        data=order,
+        status_code=status.HTTP_200_OK,
+    )
+
+
+async def validate_orders_batch(
+    order_ids: list[int], session: AsyncSession
+) -> list[OrderConfirmResult]:
+    """
+    Перевірка оплати багатьох замовлень: один запит на замовлення, один запит на
+    кандидатні транзакції, зіставлення в пам'яті та один коміт для всіх змін.
+    Рядки замовлень і транзакцій блокуються до коміту.
+    :return: результат для кожного переданого номера замовлення
+    """
+    stmt = (
+        select(Order)
+        .where(Order.id.in_(set(order_ids)))
+        .order_by(Order.id)
+        .with_for_update()
+    )
+    orders = {order.id: order for order in (await session.execute(stmt)).scalars()}
+
+    open_orders = sorted(
+        (order for order in orders.values() if order.status == OrderStatus.created),
+        key=lambda order: order.timestamp,
+    )
+    candidates: dict[tuple, list[Payment]] = {}
+    if open_orders:
+        keys = {(order.jar_id, order.amount, order.comment) for order in open_orders}
+        stmt = (
+            select(Payment)
+            .where(
+                tuple_(Payment.jar_id, Payment.amount, Payment.comment).in_(keys),
+                Payment.order_id.is_(None),
             )
+            .order_by(Payment.id)
+            # транзакції, які вже підтверджує інший запит, пропускаються
+            .with_for_update(skip_locked=True)
+        )
+        for payment in (await session.execute(stmt)).scalars():
+            candidates.setdefault(
+                (payment.jar_id, payment.amount, payment.comment), []
+            ).append(payment)
+
+    # Найстаріші замовлення отримують перші придатні транзакції
+    linked_payments: dict[int, Payment] = {}
+    for order in open_orders:
+        payments = candidates.get((order.jar_id, order.amount, order.comment), [])
+        for payment in payments:
+            if payment.time > order.timestamp:
+                payments.remove(payment)
+                order.status = OrderStatus.paid
+                payment.order_id = order.id
+                linked_payments[order.id] = payment
+                break
+    if linked_payments:
+        await session.flush()
+        for order_id in linked_payments:
+            await publish_order_status(orders[order_id], session)
+
+    # Транзакції замовлень, оплачених раніше: одним запитом, без блокування
+    paid_before = [
+        order.id
+        for order in orders.values()
+        if order.status == OrderStatus.paid and order.id not in linked_payments
+    ]
+    payment_ids = {order_id: payment.id for order_id, payment in linked_payments.items()}
+    if paid_before:
+        stmt = select(Payment.order_id, Payment.id).where(
+            Payment.order_id.in_(paid_before)
+        )
+        payment_ids.update((await session.execute(stmt)).all())
+
+    results = []
+    for order_id in order_ids:
+        order = orders.get(order_id)
+        if order is None:
+            results.append(OrderConfirmResult(order_id=order_id, result="not_found"))
+            continue
+        if order_id in linked_payments:
+            result = "paid"
+        elif order.status == OrderStatus.paid:
+            result = "already_paid"
+        elif order.status == OrderStatus.created:
+            result = "pending"
         else:
-            print(validation_approve["time"])
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Transaction is not valid",
+            result = "not_payable"
+        results.append(
+            OrderConfirmResult(
+                order_id=order_id,
+                result=result,
+                status=order.status,
+                payment_id=payment_ids.get(order_id),
             )
+        )
+    return results
+
+
+def filter_orders_stmt(
+    jar_id: str | None = None,
+    order_status: OrderStatus | None = None,
+    time_from: float | None = None,
+    time_to: float | None = None,
+):
+    """Вибірка замовлень за фільтрами списку та вивантаження"""
+    stmt = select(
+        Order.id,
+        Order.jar_id,
+        Order.amount,
+        Order.comment,
+        Order.status,
+        Order.timestamp,
+    )
+    if jar_id is not None:
+        stmt = stmt.where(Order.jar_id == jar_id)
+    if order_status is not None:
+        stmt = stmt.where(Order.status == order_status)
+    if time_from is not None:
+        stmt = stmt.where(Order.timestamp >= time_from)
+    if time_to is not None:
+        stmt = stmt.where(Order.timestamp < time_to)
+    return stmt
+
+
+def list_orders_stmt(cursor: str | None = None, **filters):
+    """
+    Запит сторінки замовлень від найновіших з курсором по (timestamp, id).
+    Обслуговується індексами ix_orders_jar_id_timestamp_id та ix_orders_status_timestamp_id.
+    """
+    return keyset_page(filter_orders_stmt(**filters), Order.timestamp, Order.id, cursor)
+
+
+def export_orders_stmt(**filters):
+    """Вивантаження замовлень у порядку створення"""
+    return filter_orders_stmt(**filters).order_by(Order.id)
+
+
+def order_list_item(row) -> dict:
+    item = row._asdict()
+    item["status"] = row.status.value
+    return item
+
+
+async def order_status_snapshot(
+    order_ids: set[int], session: AsyncSession
+) -> list[dict]:
+    """Поточний статус замовлень — перша подія для нового підписника"""
+    if not order_ids:
+        return []
+    stmt = select(Order).where(Order.id.in_(order_ids)).order_by(Order.id)
+    return [order_event(order) for order in (await session.execute(stmt)).scalars()]
 
 
 async def issue_new_order(data_in: OrderCreate, session: AsyncSession):
@@ -79,12 +245,14 @@ async def issue_new_order(data_in: OrderCreate, session: AsyncSession):
         timestamp=datetime.now().timestamp(),
     )
     session.add(new_transaction)
-    await session.commit()
-    await session.refresh(new_transaction)
+    await session.flush()
+    await event_bus.publish(session, ORDER_CREATED, order_event(new_transaction))
     return new_transaction
 
 
 async def delete_order(order: Order, session: AsyncSession):
+    event = order_event(order) | {"status": "deleted"}
     await session.delete(order)
-    await session.commit()
+    await session.flush()
+    await event_bus.publish(session, ORDER_DELETED, event)
     raise HTTPException(status_code=status.HTTP_204_NO_CONTENT, detail="Order deleted")
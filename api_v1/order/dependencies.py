@@ -2,7 +2,9 @@ from fastapi import HTTPException, status
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from api_v1.order.notifier import order_event
 from core.config import service_token
+from core.event_bus import ORDER_PAID, ORDER_STATUS_CHANGED, event_bus
 from core.models.order import Order, OrderStatus
 from core.models.payment import Payment
 
@@ -21,11 +23,20 @@ async def change_order_status(
 ):
     order.status = status_to_set
     session.add(order)
-    await session.commit()
-    await session.refresh(order)
+    await session.flush()
+    await publish_order_status(order, session)
     return order
 
 
+async def publish_order_status(order: Order, session: AsyncSession):
+    """
+    Подія зміни статусу: після коміту оновлює індекс зіставлення та надсилає
+    новий статус підписникам у кожному воркері
+    """
+    event_type = ORDER_PAID if order.status == OrderStatus.paid else ORDER_STATUS_CHANGED
+    await event_bus.publish(session, event_type, order_event(order))
+
+
 async def connect_order_to_payment(
     order: Order, transaction: Payment, session: AsyncSession
 ):
@@ -38,12 +49,6 @@ async def connect_order_to_payment(
     # connect payment to order record
     transaction.order_id = order.id
     session.add(transaction)
-    await session.commit()
-    await session.refresh(transaction)
-
-    # update payment data
-    order.payment_id = transaction
-    session.add(order)
-    await session.commit()
-    await session.refresh(order)
+    await session.flush()
     return order
+
@@ -0,0 +1,126 @@
+from bisect import insort
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api_v1.order.notifier import order_event
+from core.event_bus import ORDER_PAID, event_bus
+from core.models.order import Order, OrderStatus
+from core.models.payment import Payment
+
+MatchKey = tuple[str, int, str]
+
+
+class OrderMatcher:
+    """
+    Індекс відкритих замовлень (status=created) за ключем (jar_id, amount, comment).
+    Кожна нова транзакція знаходить своє замовлення одним пошуком у словнику,
+    без запитів до таблиці платежів.
+    """
+
+    def __init__(self):
+        # ключ -> [(timestamp, order_id)], впорядковано від найстарішого замовлення
+        self._index: dict[MatchKey, list[tuple[float, int]]] = {}
+        self._keys: dict[int, MatchKey] = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    async def rebuild(self, session: AsyncSession):
+        """Заново заповнити індекс відкритими замовленнями з бази даних"""
+        stmt = select(
+            Order.id, Order.jar_id, Order.amount, Order.comment, Order.timestamp
+        ).where(Order.status == OrderStatus.created)
+        rows = (await session.execute(stmt)).all()
+        self._index.clear()
+        self._keys.clear()
+        for row in rows:
+            self._add(row.id, (row.jar_id, row.amount, row.comment), row.timestamp)
+
+    def apply_event(self, event: dict):
+        """Оновити індекс за подією замовлення з шини (order_event)"""
+        if event["status"] != OrderStatus.created.value:
+            self.discard(event["order_id"])
+            return
+        self._add(
+            event["order_id"],
+            (event["jar_id"], event["amount"], event["comment"]),
+            event["timestamp"],
+        )
+
+    def _add(self, order_id: int, key: MatchKey, timestamp: float):
+        self.discard(order_id)
+        insort(self._index.setdefault(key, []), (timestamp, order_id))
+        self._keys[order_id] = key
+
+    def discard(self, order_id: int):
+        key = self._keys.pop(order_id, None)
+        if key is None:
+            return
+        orders = self._index[key]
+        orders[:] = [entry for entry in orders if entry[1] != order_id]
+        if not orders:
+            del self._index[key]
+
+    def find(
+        self,
+        jar_id: str,
+        amount: int,
+        comment: str,
+        before: float,
+        exclude: set[int] = frozenset(),
+    ) -> int | None:
+        """
+        Найстаріше відкрите замовлення з таким ключем, створене до `before`,
+        крім замовлень з `exclude`
+        """
+        for timestamp, order_id in self._index.get((jar_id, amount, comment), ()):
+            if timestamp >= before:
+                break
+            if order_id not in exclude:
+                return order_id
+        return None
+
+    async def match_payments(
+        self, payments: list[Payment], session: AsyncSession
+    ) -> list[Order]:
+        """
+        Закрити відкриті замовлення новими транзакціями: замовлення позначається
+        оплаченим, а транзакція прив'язується до нього. Зміни фіксуються комітом
+        unit of work разом з додаванням самих транзакцій; індекс оновлюється
+        подією order.paid лише після коміту, тож відкат лишає замовлення в індексі.
+        """
+        paid_orders = []
+        # замовлення, вже використані в цьому виклику (до коміту вони ще в індексі)
+        claimed: set[int] = set()
+        for payment in payments:
+            if payment.order_id is not None or not payment.comment:
+                continue
+            order = None
+            while order is None:
+                order_id = self.find(
+                    payment.jar_id,
+                    payment.amount,
+                    payment.comment,
+                    payment.time,
+                    exclude=claimed,
+                )
+                if order_id is None:
+                    break
+                claimed.add(order_id)
+                order = await session.get(Order, order_id, with_for_update=True)
+                if order is None or order.status != OrderStatus.created:
+                    # Індекс застарів (замовлення закрите іншим процесом) — наступний кандидат
+                    order = None
+            if order is None:
+                continue
+            order.status = OrderStatus.paid
+            payment.order_id = order.id
+            paid_orders.append(order)
+            await event_bus.publish(session, ORDER_PAID, order_event(order))
+        if paid_orders:
+            await session.flush()
+        return paid_orders
+
+
+order_matcher = OrderMatcher()
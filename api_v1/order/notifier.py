@@ -0,0 +1,94 @@
+import asyncio
+import logging
+
+from core.models.order import Order
+
+logger = logging.getLogger(__name__)
+
+
+class Subscription:
+    """
+    Черга подій одного клієнта. Повільний клієнт не гальмує публікацію:
+    при переповненні черги найстаріша подія відкидається.
+    """
+
+    def __init__(self, order_ids: set[int], jar_id: str | None, maxsize: int):
+        self.order_ids = order_ids
+        self.jar_id = jar_id
+        self.queue: asyncio.Queue[dict] = asyncio.Queue(maxsize=maxsize)
+
+    def put(self, event: dict):
+        if self.queue.full():
+            self.queue.get_nowait()
+        self.queue.put_nowait(event)
+
+    async def get(self, timeout: float | None = None) -> dict | None:
+        """Наступна подія або None, якщо за timeout нічого не надійшло"""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class OrderNotifier:
+    """
+    Внутрішньопроцесний pub/sub змін статусу замовлень. Підписка — на номери
+    замовлень та/або банку; публікація знаходить підписників двома пошуками у словнику.
+    """
+
+    def __init__(self, queue_size: int = 100):
+        self.queue_size = queue_size
+        self._by_order: dict[int, set[Subscription]] = {}
+        self._by_jar: dict[str, set[Subscription]] = {}
+
+    def __len__(self) -> int:
+        return len(
+            {sub for subs in self._by_order.values() for sub in subs}
+            | {sub for subs in self._by_jar.values() for sub in subs}
+        )
+
+    def subscribe(
+        self, order_ids: set[int] | None = None, jar_id: str | None = None
+    ) -> Subscription:
+        subscription = Subscription(set(order_ids or ()), jar_id, self.queue_size)
+        for order_id in subscription.order_ids:
+            self._by_order.setdefault(order_id, set()).add(subscription)
+        if jar_id is not None:
+            self._by_jar.setdefault(jar_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        for order_id in subscription.order_ids:
+            subs = self._by_order.get(order_id)
+            if subs is not None:
+                subs.discard(subscription)
+                if not subs:
+                    del self._by_order[order_id]
+        if subscription.jar_id is not None:
+            subs = self._by_jar.get(subscription.jar_id)
+            if subs is not None:
+                subs.discard(subscription)
+                if not subs:
+                    del self._by_jar[subscription.jar_id]
+
+    def publish(self, event: dict):
+        subscribers = self._by_order.get(event["order_id"], set()) | self._by_jar.get(
+            event["jar_id"], set()
+        )
+        for subscription in subscribers:
+            subscription.put(event)
+
+
+def order_event(order: Order) -> dict:
+    """Стан замовлення для подій шини та підписників"""
+    return dict(
+        order_id=order.id,
+        jar_id=order.jar_id,
+        status=order.status.value,
+        amount=order.amount,
+        comment=order.comment,
+        timestamp=order.timestamp,
+    )
+
+
+order_notifier = OrderNotifier()
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Annotated
+from typing import Annotated, Literal, Optional
 
 from api_v1.payment.schemas import PaymentDescriptionData
 from core.models.order import OrderStatus
@@ -37,3 +37,21 @@ class OrderCreate(OrderBase):
 class OrderOut(OrderBase):
     id: int
     status: OrderStatus
+
+
+class OrderConfirmBatch(BaseModel):
+    order_ids: Annotated[
+        list[int],
+        Field(
+            description="Номери замовлень для перевірки оплати",
+            min_length=1,
+            max_length=500,
+        ),
+    ]
+
+
+class OrderConfirmResult(BaseModel):
+    order_id: int
+    result: Literal["paid", "already_paid", "pending", "not_payable", "not_found"]
+    status: Optional[OrderStatus] = None
+    payment_id: Optional[int] = None
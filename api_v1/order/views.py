@@ -1,37 +1,212 @@
-from typing import Annotated
+import asyncio
+import json
+from typing import Annotated, Optional
 
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException, Request, WebSocket, status
+from fastapi.responses import StreamingResponse
+from starlette.websockets import WebSocketDisconnect
 from fastapi.params import Query, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from api_v1.auth import auth_by_operation_token
+from api_v1.auth import auth_by_operation_token, websocket_has_operation_token
 from api_v1.order.crud import (
     issue_new_order,
     validate_order,
+    validate_orders_batch,
     delete_order, return_order_by_id,
+    list_orders_stmt,
+    export_orders_stmt,
+    order_list_item,
+    order_status_snapshot,
 )
+from api_v1.order.notifier import order_notifier
 from api_v1.order.schemas import (
     OrderCreate,
     OrderOut,
+    OrderConfirmBatch,
+    OrderConfirmResult,
 )
 from core import db_helper
+from core.export import ExportFormat, stream_export
+from core.models.order import OrderStatus
+from core.pagination import MAX_PAGE_SIZE, stream_page
 
 router = APIRouter(
     prefix="/order", tags=["Order"], dependencies=[Depends(auth_by_operation_token)]
 )
+# APIKeyHeader не працює з WebSocket, тому токен перевіряється в самому ендпоінті
+ws_router = APIRouter(prefix="/order", tags=["Order"])
+
+MAX_SUBSCRIBED_ORDERS = 100
+KEEPALIVE_SECONDS = 15.0
+
+
+def subscription_error(order_ids: set[int], jar_id: str | None) -> str | None:
+    if not order_ids and jar_id is None:
+        return "Pass order_id or jar_id to subscribe"
+    if len(order_ids) > MAX_SUBSCRIBED_ORDERS:
+        return f"At most {MAX_SUBSCRIBED_ORDERS} orders per subscription"
+    return None
+
+
+async def initial_events(order_ids: set[int]) -> list[dict]:
+    # сесія відкривається тут: потік живе довше за сесію запиту
+    async with db_helper.session_factory() as session:
+        return await order_status_snapshot(order_ids, session)
 
 
 @router.get("/get/by-id", response_model=OrderOut)
 async def get_order_by_id(
-    order_id: int, session: AsyncSession = Depends(db_helper.scoped_session_dependency)
+    order_id: int, session: AsyncSession = Depends(db_helper.session_dependency)
 ):
     return await return_order_by_id(order_id=order_id, session=session)
 
 
+@router.get("/list")
+async def list_orders(
+    jar_id: Optional[str] = None,
+    order_status: Annotated[Optional[OrderStatus], Query(alias="status")] = None,
+    time_from: Annotated[Optional[float], Query(description="Unix-час, включно")] = None,
+    time_to: Annotated[Optional[float], Query(description="Unix-час, не включно")] = None,
+    cursor: Annotated[
+        Optional[str], Query(description="next_cursor з попередньої сторінки")
+    ] = None,
+    limit: Annotated[int, Query(ge=1, le=MAX_PAGE_SIZE)] = 50,
+):
+    """
+    Список замовлень від найновіших. Для наступної сторінки передайте next_cursor
+    з відповіді; null означає останню сторінку.
+    """
+    stmt = list_orders_stmt(
+        cursor=cursor,
+        jar_id=jar_id,
+        order_status=order_status,
+        time_from=time_from,
+        time_to=time_to,
+    )
+    return stream_page(stmt, limit=limit, position_key="timestamp")
+
+
+@router.get("/export")
+async def export_orders(
+    jar_id: Optional[str] = None,
+    order_status: Annotated[Optional[OrderStatus], Query(alias="status")] = None,
+    time_from: Annotated[Optional[float], Query(description="Unix-час, включно")] = None,
+    time_to: Annotated[Optional[float], Query(description="Unix-час, не включно")] = None,
+    export_format: Annotated[ExportFormat, Query(alias="format")] = "ndjson",
+    gzip: bool = False,
+):
+    """
+    Повне вивантаження замовлень за фільтрами у NDJSON або CSV (gzip=true — стиснуте).
+    Рядки передаються потоком, розмір вивантаження не обмежений.
+    """
+    stmt = export_orders_stmt(
+        jar_id=jar_id,
+        order_status=order_status,
+        time_from=time_from,
+        time_to=time_to,
+    )
+    return stream_export(
+        stmt,
+        filename="orders",
+        export_format=export_format,
+        gzip=gzip,
+        serialize=order_list_item,
+    )
+
+
+@router.get("/subscribe")
+async def subscribe_orders(
+    request: Request,
+    order_id: Annotated[Optional[list[int]], Query()] = None,
+    jar_id: Optional[str] = None,
+):
+    """
+    Server-Sent Events зі зміною статусу замовлень: ?order_id=1&order_id=2 та/або ?jar_id=...
+    Спочатку надходить поточний статус вказаних замовлень, далі — кожна зміна.
+    """
+    order_ids = set(order_id or ())
+    error = subscription_error(order_ids, jar_id)
+    if error:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error)
+
+    async def events():
+        # підписка всередині генератора: інакше, якщо стрим так і не стартує,
+        # finally не виконається; і до читання знімка, щоб не пропустити зміну
+        subscription = order_notifier.subscribe(order_ids=order_ids, jar_id=jar_id)
+        try:
+            for event in await initial_events(order_ids):
+                yield f"event: order\ndata: {json.dumps(event)}\n\n"
+            while not await request.is_disconnected():
+                event = await subscription.get(timeout=KEEPALIVE_SECONDS)
+                if event is None:
+                    yield ": keepalive\n\n"
+                    continue
+                yield f"event: order\ndata: {json.dumps(event)}\n\n"
+        finally:
+            order_notifier.unsubscribe(subscription)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@ws_router.websocket("/ws")
+async def order_status_websocket(
+    websocket: WebSocket,
+    order_id: Annotated[Optional[list[int]], Query()] = None,
+    jar_id: Optional[str] = None,
+):
+    """
+    WebSocket зі зміною статусу замовлень; параметри підписки ті самі, що й у /order/subscribe.
+    Токен — заголовок X-Operation-Token або ?token=...
+    Кожне повідомлення — JSON з order_id, jar_id, status (deleted — замовлення видалено),
+    amount, comment, timestamp.
+    """
+    if not websocket_has_operation_token(websocket):
+        await websocket.close(
+            code=status.WS_1008_POLICY_VIOLATION, reason="Invalid operation token"
+        )
+        return
+    order_ids = set(order_id or ())
+    error = subscription_error(order_ids, jar_id)
+    if error:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason=error)
+        return
+    await websocket.accept()
+    subscription = order_notifier.subscribe(order_ids=order_ids, jar_id=jar_id)
+
+    async def wait_disconnect():
+        # клієнт нічого не надсилає; читання потрібне лише, щоб помітити відключення
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass
+
+    disconnected = asyncio.create_task(wait_disconnect())
+    try:
+        for event in await initial_events(order_ids):
+            await websocket.send_json(event)
+        while not disconnected.done():
+            next_event = asyncio.create_task(subscription.get())
+            await asyncio.wait(
+                {next_event, disconnected}, return_when=asyncio.FIRST_COMPLETED
+            )
+            if not next_event.done():
+                next_event.cancel()
+                break
+            await websocket.send_json(next_event.result())
+    except WebSocketDisconnect:
+        pass
+    finally:
+        disconnected.cancel()
+        order_notifier.unsubscribe(subscription)
+
+
 @router.post("/create")
 async def create_order(
     data: Annotated[OrderCreate, Query()],
-    session: AsyncSession = Depends(db_helper.scoped_session_dependency),
+    session: AsyncSession = Depends(db_helper.session_dependency),
 ):
     """
     Створення замовлення для підтвердження винагороди донатеру.
@@ -43,12 +218,12 @@ async def create_order(
 @router.patch("/confirm", response_model=OrderOut)
 async def confirm_order(
     order_id: int,
-    session: AsyncSession = Depends(db_helper.scoped_session_dependency),
+    session: AsyncSession = Depends(db_helper.session_dependency),
 ):
     """
     Перевірка підтвердження замовлення
     """
-    order_by_id = await return_order_by_id(order_id, session)
+    order_by_id = await return_order_by_id(order_id, session, for_update=True)
 
     await validate_order(session=session, order=order_by_id)
 
@@ -61,10 +236,22 @@ async def confirm_order(
     )
 
 
+@router.post("/confirm/batch", response_model=list[OrderConfirmResult])
+async def confirm_orders_batch(
+    data: OrderConfirmBatch,
+    session: AsyncSession = Depends(db_helper.session_dependency),
+):
+    """
+    Перевірка підтвердження багатьох замовлень одним запитом.
+    Повертає результат для кожного замовлення: paid, already_paid, pending, not_payable, not_found
+    """
+    return await validate_orders_batch(order_ids=data.order_ids, session=session)
+
+
 @router.delete("/delete")
 async def order_delete(
     order_id: int,
-    session: AsyncSession = Depends(db_helper.scoped_session_dependency),
+    session: AsyncSession = Depends(db_helper.session_dependency),
 ):
     """
     Видалення замовлення за номером замовлення
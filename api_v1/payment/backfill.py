@@ -0,0 +1,170 @@
+"""
+Довантаження історичної виписки банки за довільний проміжок.
+
+    python -m api_v1.payment.backfill --jar-id <jar_id> --from 2025-01-01 [--to 2025-12-31]
+
+Токен Monobank береться з --token або змінної середовища MONOBANK_TOKEN.
+Перерваний запуск з тими самими параметрами продовжується з останнього завершеного вікна.
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+from datetime import datetime
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api_v1.payment.crud import (
+    fetch_statement_window,
+    ingest_statement,
+    save_sync_state,
+)
+from api_v1.system.dependencies import MAX_STATEMENT_INTERVAL
+from core.db_helper import db_helper
+from core.models.jar import BackfillJob
+from core.monobank import monobank_client
+
+logger = logging.getLogger(__name__)
+
+
+def split_into_windows(from_time: int, to_time: int) -> list[tuple[int, int]]:
+    """Розбити проміжок на вікна, які Monobank дозволяє запитати одним запитом"""
+    windows = []
+    start = from_time
+    while start < to_time:
+        end = min(start + MAX_STATEMENT_INTERVAL, to_time)
+        windows.append((start, end))
+        start = end
+    return windows
+
+
+async def get_or_create_job(
+    jar_id: str, from_time: int, to_time: int | None, session: AsyncSession
+) -> BackfillJob:
+    """
+    Знайти незавершене завдання з тими самими параметрами або створити нове.
+    Без to_time продовжується останнє незавершене завдання від того ж from_time,
+    а нове завдання створюється до поточного моменту.
+    """
+    stmt = select(BackfillJob).where(
+        BackfillJob.jar_id == jar_id,
+        BackfillJob.from_time == from_time,
+        BackfillJob.finished.is_(False),
+    )
+    if to_time is not None:
+        stmt = stmt.where(BackfillJob.to_time == to_time)
+    job = (await session.execute(stmt.order_by(BackfillJob.id.desc()))).scalars().first()
+    if job is None:
+        if to_time is None:
+            to_time = int(datetime.now().timestamp())
+        job = BackfillJob(
+            jar_id=jar_id,
+            from_time=from_time,
+            to_time=to_time,
+            completed_until=from_time,
+            finished=False,
+        )
+        session.add(job)
+        await session.commit()
+    return job
+
+
+async def backfill_window(
+    monobank_token: str,
+    jar_id: str,
+    from_time: int,
+    to_time: int,
+    session: AsyncSession,
+) -> int:
+    """
+    Внести в реєстр одне вікно виписки (усі сторінки) та посунути курсор синхронізації.
+    Сторінки отримуються до першого запиту в сесії: очікування ліміту токена
+    не тримає відкриту транзакцію.
+    :return: кількість нових транзакцій
+    """
+    transactions = await fetch_statement_window(
+        monobank_token=monobank_token,
+        jar_id=jar_id,
+        from_time=from_time,
+        to_time=to_time,
+    )
+    new_payments, latest_time = await ingest_statement(
+        jar_id=jar_id, transactions=transactions, session=session
+    )
+    await save_sync_state(jar_id=jar_id, latest_time=latest_time, session=session)
+    return len(new_payments)
+
+
+async def run_backfill(
+    monobank_token: str, jar_id: str, from_time: int, to_time: int | None = None
+) -> BackfillJob:
+    """
+    Довантажити виписку банки за [from_time, to_time] вікнами по 31 добі в межах
+    ліміту токена. Прогрес зберігається після кожного вікна.
+    """
+    if to_time is not None and from_time > to_time:
+        raise ValueError("Початковий час не може бути пізніше кінцевого")
+
+    async with db_helper.session_factory() as session:
+        job = await get_or_create_job(
+            jar_id=jar_id, from_time=from_time, to_time=to_time, session=session
+        )
+        windows = split_into_windows(job.completed_until, job.to_time)
+        for window_from, window_to in windows:
+            added = await backfill_window(
+                monobank_token=monobank_token,
+                jar_id=jar_id,
+                from_time=window_from,
+                to_time=window_to,
+                session=session,
+            )
+            job.completed_until = window_to
+            job.updated_at = datetime.now().timestamp()
+            await session.commit()
+            logger.info(
+                "Backfill %s: %s - %s, %d new payments",
+                jar_id,
+                datetime.fromtimestamp(window_from),
+                datetime.fromtimestamp(window_to),
+                added,
+            )
+
+        job.finished = True
+        job.updated_at = datetime.now().timestamp()
+        await session.commit()
+        return job
+
+
+def _parse_time(value: str) -> int:
+    if value.isdigit():
+        return int(value)
+    return int(datetime.fromisoformat(value).timestamp())
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Довантаження історичної виписки банки")
+    parser.add_argument("--jar-id", required=True)
+    parser.add_argument("--from", dest="from_time", required=True, type=_parse_time)
+    parser.add_argument("--to", dest="to_time", type=_parse_time)
+    parser.add_argument("--token", default=os.getenv("MONOBANK_TOKEN"))
+    args = parser.parse_args()
+    if not args.token:
+        parser.error("--token or MONOBANK_TOKEN is required")
+
+    logging.basicConfig(level=logging.INFO)
+    try:
+        await run_backfill(
+            monobank_token=args.token,
+            jar_id=args.jar_id,
+            from_time=args.from_time,
+            to_time=args.to_time,
+        )
+    finally:
+        await monobank_client.close()
+        await db_helper.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
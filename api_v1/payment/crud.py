@@ -1,34 +1,78 @@
+from datetime import datetime
+
+import httpx
 from fastapi import HTTPException, status
+from pydantic import ValidationError
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from api_v1.system.dependencies import request_jar_info
+from api_v1.system.dependencies import (
+    STATEMENT_PAGE_LIMIT,
+    get_one_month_ago,
+    request_jar_info,
+)
+from core.config import settings
+from core.db_helper import db_helper
+from core.monobank import token_hash
+from core.single_flight import statement_flight
+from core.event_bus import PAYMENT_INGESTED, event_bus
+from core.models.jar import Jar, JarSyncState
 from core.models.payment import Payment
+from core.pagination import keyset_page
 
 from api_v1.payment.schemas import (
     PaymentSearch,
     CreatePaymentJarRecord,
     PaymentOut,
+    WebhookData,
+    WebhookEvent,
 )
+from api_v1.order.matcher import order_matcher
 from api_v1.payment.dependencies import (
+    add_payments_bulk,
     add_payment_if_not_exists,
 )
 
 
-async def search_payment(data: PaymentSearch, session: AsyncSession) -> dict:
+async def search_payment(
+    data: PaymentSearch,
+    session: AsyncSession,
+    unclaimed_only: bool = False,
+    for_update: bool = False,
+    paid_after: float | None = None,
+) -> dict:
     """
     Пошук виконаної транзакції серед уже зареєстрованих у реєстрі.
+    Запит обслуговується індексом ix_payments_jar_id_amount_comment і читає лише
+    колонки, потрібні для PaymentOut.
     :param data: Дані, за якими виконується пошук в базі даних
     :param session: сесія бази даних
+    :param unclaimed_only: шукати лише платежі, ще не прив'язані до замовлення
+    :param for_update: заблокувати знайдений рядок до коміту; рядки, заблоковані
+        іншими транзакціями, пропускаються (SKIP LOCKED)
+    :param paid_after: лише транзакції, виконані пізніше (час створення замовлення);
+        з кількох повертається найстаріша
     :return: транзація з реєстру
     """
-    stmt = select(Payment).where(
+    stmt = select(
+        Payment.id,
+        Payment.jar_id,
+        Payment.amount,
+        Payment.comment,
+        Payment.time,
+    ).where(
         Payment.jar_id == data.jar_id,
         Payment.amount == data.amount,
         Payment.comment == data.comment,
     )
-    result = await session.execute(stmt)
-    payment = result.scalars().first()
+    if unclaimed_only:
+        stmt = stmt.where(Payment.order_id.is_(None))
+    if paid_after is not None:
+        stmt = stmt.where(Payment.time > paid_after).order_by(Payment.time, Payment.id)
+    if for_update:
+        stmt = stmt.with_for_update(skip_locked=True)
+    result = await session.execute(stmt.limit(1))
+    payment = result.first()
     if payment is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found")
     payment_data = PaymentOut(
@@ -41,17 +85,96 @@ async def search_payment(data: PaymentSearch, session: AsyncSession) -> dict:
     return dict(payment_data)
 
 
-async def update_all_jars_payments(
-    monobank_token: str, jar_id: str, session: AsyncSession
+def filter_payments_stmt(
+    jar_id: str | None = None,
+    time_from: int | None = None,
+    time_to: int | None = None,
+    matched: bool | None = None,
 ):
     """
-    Оновити реєстр усіх транзакцій за певним токеном та певним та певним ідентифікатором рахунку
+    Вибірка транзакцій за фільтрами списку та вивантаження.
+    """
+    stmt = select(
+        Payment.id,
+        Payment.jar_id,
+        Payment.order_id,
+        Payment.monobank_transaction_id,
+        Payment.amount,
+        Payment.comment,
+        Payment.time,
+    )
+    if jar_id is not None:
+        stmt = stmt.where(Payment.jar_id == jar_id)
+    if time_from is not None:
+        stmt = stmt.where(Payment.time >= time_from)
+    if time_to is not None:
+        stmt = stmt.where(Payment.time < time_to)
+    if matched is not None:
+        stmt = stmt.where(
+            Payment.order_id.is_not(None) if matched else Payment.order_id.is_(None)
+        )
+    return stmt
+
+
+def list_payments_stmt(cursor: str | None = None, **filters):
+    """
+    Запит сторінки транзакцій від найновіших з курсором по (time, id).
+    Обслуговується індексами ix_payments_jar_id_time_id та ix_payments_time_id.
+    """
+    return keyset_page(filter_payments_stmt(**filters), Payment.time, Payment.id, cursor)
+
+
+def export_payments_stmt(**filters):
+    """Вивантаження транзакцій у хронологічному порядку"""
+    return filter_payments_stmt(**filters).order_by(Payment.time, Payment.id)
+
+
+def payment_list_item(row) -> dict:
+    return row._asdict()
+
+
+async def get_sync_state(jar_id: str, session: AsyncSession) -> JarSyncState | None:
+    stmt = select(JarSyncState).where(JarSyncState.jar_id == jar_id)
+    return (await session.execute(stmt)).scalar_one_or_none()
+
+
+async def save_sync_state(
+    jar_id: str, latest_time: int | None, session: AsyncSession
+) -> JarSyncState:
+    """
+    Зберегти курсор банки: час найновішої транзакції, яка вже є в реєстрі.
     """
-    transactions = await request_jar_info(jar_id=jar_id, api_token=monobank_token)
-    new_payments = []
+    sync_state = await get_sync_state(jar_id=jar_id, session=session)
+    if sync_state is None:
+        sync_state = JarSyncState(jar_id=jar_id)
+        session.add(sync_state)
 
-    for transaction in transactions:
-        record = CreatePaymentJarRecord(
+    if latest_time is not None and (
+        sync_state.last_seen_time is None or latest_time > sync_state.last_seen_time
+    ):
+        sync_state.last_seen_time = latest_time
+    sync_state.synced_at = datetime.now().timestamp()
+    await session.flush()
+    return sync_state
+
+
+def incremental_from_time(sync_state: JarSyncState | None) -> int | None:
+    """
+    Початок проміжку для наступного запиту виписки: останній відомий час мінус перекриття
+    (для транзакцій, що з'являються у виписці із запізненням).
+    Курсор, старший за місяць, обрізається до місяця — старіші дані довантажує backfill.
+    """
+    if sync_state is None or sync_state.last_seen_time is None:
+        return None
+    from_time = sync_state.last_seen_time - settings.monobank.sync_overlap_seconds
+    return max(from_time, get_one_month_ago())
+
+
+def statement_to_records(
+    jar_id: str, transactions: list[dict]
+) -> list[CreatePaymentJarRecord]:
+    return [
+        CreatePaymentJarRecord(
             jar_id=jar_id,
             id=transaction["id"],
             amount=transaction["amount"],
@@ -59,12 +182,203 @@ async def update_all_jars_payments(
             comment=transaction.get("comment") or None,
             time=transaction["time"],
         )
-        new_transaction = await add_payment_if_not_exists(record, session)
-        if new_transaction:
-            new_payments.append(new_transaction)
+        for transaction in transactions
+    ]
+
+
+async def publish_payments_ingested(
+    jar_id: str, payments: list[Payment], session: AsyncSession
+):
+    """
+    Подія про нові транзакції банки. Сторінка виписки — не більше 500 транзакцій,
+    тож номери вміщуються в обмеження NOTIFY (8000 байт).
+    """
+    if payments:
+        await event_bus.publish(
+            session,
+            PAYMENT_INGESTED,
+            {"jar_id": jar_id, "payment_ids": [payment.id for payment in payments]},
+        )
+
+
+async def fetch_statement_window(
+    monobank_token: str, jar_id: str, from_time: int, to_time: int
+) -> list[dict]:
+    """
+    Отримати вікно виписки [from_time, to_time] повністю. Monobank повертає не більше
+    500 транзакцій (від найновіших), тому при повній сторінці запит повторюється до часу
+    найстарішої отриманої транзакції. Кожна сторінка чекає на ліміт токена (60 с),
+    тому функція викликається поза транзакцією бази даних.
+    """
+    transactions = []
+    page_to = to_time
+    while True:
+        page = await request_jar_info(
+            api_token=monobank_token, jar_id=jar_id, from_time=from_time, to_time=page_to
+        )
+        transactions.extend(page)
+        if len(page) < STATEMENT_PAGE_LIMIT:
+            break
+        oldest = min(int(transaction["time"]) for transaction in page)
+        # Транзакції на межі сторінки повторяться — їх відкине add_payments_bulk.
+        # Якщо вся сторінка в межах однієї секунди, зсуваємося, щоб не зациклитися.
+        page_to = oldest if oldest < page_to else page_to - 1
+        if page_to <= from_time:
+            break
+    return transactions
+
+
+async def ingest_statement(
+    jar_id: str, transactions: list[dict], session: AsyncSession
+) -> tuple[list[Payment], int | None]:
+    """
+    Пакетно внести отриману виписку в реєстр, подія — на кожні 500 нових транзакцій.
+    :return: нові транзакції та час найновішої транзакції виписки
+    """
+    records = statement_to_records(jar_id=jar_id, transactions=transactions)
+    new_payments = await add_payments_bulk(records, session)
+    for start in range(0, len(new_payments), STATEMENT_PAGE_LIMIT):
+        await publish_payments_ingested(
+            jar_id, new_payments[start : start + STATEMENT_PAGE_LIMIT], session
+        )
+    latest_time = max((record.time for record in records), default=None)
+    return new_payments, latest_time
+
+
+async def sync_jar_payments(monobank_token: str, jar_id: str) -> list[Payment]:
+    """
+    Інкрементально завантажити виписку банки (від збереженого курсора),
+    внести нові транзакції в реєстр та посунути курсор.
+    Усі сторінки виписки отримуються до відкриття unit of work: очікування ліміту
+    токена не тримає транзакцію, з'єднання з пулу та блокування. Курсор рухається
+    в тому ж коміті, що й транзакції, тому понад 500 нових транзакцій не губляться.
+    :return: щойно додані транзакції
+    """
+    async with db_helper.session_factory() as session:
+        sync_state = await get_sync_state(jar_id=jar_id, session=session)
+    from_time = incremental_from_time(sync_state)
+    if from_time is None:
+        from_time = get_one_month_ago()
+    transactions = await fetch_statement_window(
+        monobank_token=monobank_token,
+        jar_id=jar_id,
+        from_time=from_time,
+        to_time=int(datetime.now().timestamp()),
+    )
+
+    async with db_helper.unit_of_work() as session:
+        new_payments, latest_time = await ingest_statement(
+            jar_id=jar_id, transactions=transactions, session=session
+        )
+        await order_matcher.match_payments(new_payments, session)
+        await save_sync_state(jar_id=jar_id, latest_time=latest_time, session=session)
+    return new_payments
+
+
+async def refresh_jar_payments(monobank_token: str, jar_id: str) -> list[Payment]:
+    """
+    Інкрементальне оновлення банки. Одночасні оновлення тієї самої банки тим самим
+    токеном (ручні запити, фонове опитування) чекають на одне спільне: один запит
+    виписки та одне внесення в реєстр, а всі викликачі отримують той самий результат
+    вже після коміту.
+    Ліміт виписки враховується лише в межах процесу: якщо виписку цього токена щойно
+    запитав інший воркер, Monobank відповідає 429, і оновлення завершується
+    HTTPException 429 з Retry-After.
+    """
+    try:
+        # вікно інкрементального оновлення — від збереженого курсора до поточного моменту
+        return await statement_flight.do(
+            (token_hash(monobank_token), jar_id, "incremental"),
+            lambda: sync_jar_payments(monobank_token=monobank_token, jar_id=jar_id),
+        )
+    except httpx.HTTPStatusError as err:
+        if err.response.status_code != status.HTTP_429_TOO_MANY_REQUESTS:
+            raise
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Monobank statement limit for this token, retry later",
+            headers={"Retry-After": str(int(settings.monobank.statement_interval))},
+        )
+
+
+async def update_all_jars_payments(monobank_token: str, jar_id: str):
+    """
+    Оновити реєстр усіх транзакцій за певним токеном та певним та певним ідентифікатором рахунку
+    """
+    new_payments = await refresh_jar_payments(
+        monobank_token=monobank_token, jar_id=jar_id
+    )
     if new_payments:  # Якщо список НЕ пустий -> повернути створені
         return dict(
             status_code=status.HTTP_201_CREATED,
             detail={"message": "New payments added", "data": new_payments},
         )
     return "Everything is up to date"
+
+
+async def ingest_webhook_event(event: WebhookEvent, session: AsyncSession):
+    """
+    Внести транзакцію, отриману через webhook Monobank, у реєстр та одразу
+    спробувати закрити нею відкрите замовлення.
+    """
+    if event.type != "StatementItem":
+        return {"status": "ignored"}
+    try:
+        data = WebhookData.model_validate(event.data)
+    except ValidationError as err:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=err.errors(include_url=False),
+        )
+    item = data.statementItem
+    if item.amount <= 0:
+        # Списання з банки не є донатом
+        return {"status": "ignored"}
+
+    payment = await add_payment_if_not_exists(
+        CreatePaymentJarRecord(
+            jar_id=data.account,
+            id=item.id,
+            amount=item.amount,
+            description=item.description or None,
+            comment=item.comment or None,
+            time=item.time,
+        ),
+        session,
+    )
+    if payment is None:
+        return {"status": "duplicate"}
+
+    await publish_payments_ingested(payment.jar_id, [payment], session)
+    paid_orders = await order_matcher.match_payments([payment], session)
+    return {
+        "status": "ingested",
+        "payment_id": payment.id,
+        "order_id": paid_orders[0].id if paid_orders else None,
+    }
+
+
+async def register_jar(monobank_token: str, jar_id: str, session: AsyncSession) -> Jar:
+    """
+    Зареєструвати банку для фонового опитування виписки.
+    Повторна реєстрація оновлює токен.
+    """
+    stmt = select(Jar).where(Jar.jar_id == jar_id)
+    jar = (await session.execute(stmt)).scalar_one_or_none()
+    if jar is None:
+        jar = Jar(jar_id=jar_id, monobank_token=monobank_token)
+        session.add(jar)
+    else:
+        jar.monobank_token = monobank_token
+    await session.flush()
+    return jar
+
+
+async def unregister_jar(jar_id: str, session: AsyncSession):
+    stmt = select(Jar).where(Jar.jar_id == jar_id)
+    jar = (await session.execute(stmt)).scalar_one_or_none()
+    if jar is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found")
+    await session.delete(jar)
+    await session.flush()
+    raise HTTPException(status_code=status.HTTP_204_NO_CONTENT, detail="Jar deleted")
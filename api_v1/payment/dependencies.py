@@ -4,8 +4,12 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from api_v1.payment.schemas import CreatePaymentJarRecord
 from api_v1.system.dependencies import request_jar_info
+from core.db_helper import dialect_insert
 from core.models.payment import Payment
 
+# Кількість рядків в одному INSERT (ліміт параметрів SQLite та розмір сторінки Monobank)
+BULK_INSERT_BATCH_SIZE = 500
+
 
 async def return_payment_by_id(transaction_id: int, session: AsyncSession):
     stmt = select(Payment).where(Payment.id == transaction_id)
@@ -30,32 +34,70 @@ async def add_payment_if_not_exists(
 ):
     """
     Додає нову транзакцію, тільки якщо такої з monobank_transaction_id ще нема.
+    Дублікати відкидає унікальний індекс бази даних (ON CONFLICT DO NOTHING),
+    тому одночасні оновлення однієї банки не створюють повторних записів.
     Повертає новий запис, або None якщо транзакція вже існує.
     """
-    stmt = select(Payment).where(
-        Payment.monobank_transaction_id == data_in.monobank_transaction_id
-    )
-    result = await session.execute(stmt)
-    existing_transaction = result.scalar_one_or_none()
-
-    if existing_transaction:
-        # Транзакція вже існує – нічого не робимо
-        return None
-
-    new_transaction = Payment(
-        jar_id=data_in.jar_id,
-        monobank_transaction_id=data_in.monobank_transaction_id,
-        amount=data_in.amount,
-        description=data_in.description,
-        comment=data_in.comment,
-        time=data_in.time,
+    stmt = (
+        dialect_insert(session, Payment)
+        .values(
+            jar_id=data_in.jar_id,
+            monobank_transaction_id=data_in.monobank_transaction_id,
+            amount=data_in.amount,
+            description=data_in.description,
+            comment=data_in.comment,
+            time=data_in.time,
+        )
+        .on_conflict_do_nothing(index_elements=[Payment.monobank_transaction_id])
+        .returning(Payment)
     )
-    session.add(new_transaction)
-    await session.commit()
-    await session.refresh(new_transaction)
+    new_transaction = (await session.scalars(stmt)).one_or_none()
     return new_transaction
 
 
+async def add_payments_bulk(
+    records: list[CreatePaymentJarRecord], session: AsyncSession
+) -> list[Payment]:
+    """
+    Пакетно додає транзакції однією транзакцією бази даних.
+    Записи вставляються пакетним INSERT ... ON CONFLICT (monobank_transaction_id) DO NOTHING:
+    вже наявні транзакції відкидає унікальний індекс; коміт виконує unit of work.
+    Повертає лише щойно створені записи (через RETURNING).
+    """
+    if not records:
+        return []
+
+    # Дублікати всередині самої виписки
+    unique_records = {}
+    for record in records:
+        unique_records.setdefault(record.monobank_transaction_id, record)
+
+    rows = [
+        dict(
+            jar_id=record.jar_id,
+            monobank_transaction_id=record.monobank_transaction_id,
+            amount=record.amount,
+            description=record.description,
+            comment=record.comment,
+            time=record.time,
+        )
+        for record in unique_records.values()
+    ]
+
+    new_payments = []
+    for start in range(0, len(rows), BULK_INSERT_BATCH_SIZE):
+        batch = rows[start : start + BULK_INSERT_BATCH_SIZE]
+        insert_stmt = (
+            dialect_insert(session, Payment)
+            .values(batch)
+            .on_conflict_do_nothing(index_elements=[Payment.monobank_transaction_id])
+            .returning(Payment)
+        )
+        result = await session.scalars(insert_stmt)
+        new_payments.extend(result.all())
+    return new_payments
+
+
 async def return_all_transaction(jar_id: str, monobank_token: str):
     request = await request_jar_info(jar_id=jar_id, api_token=monobank_token)
     return request
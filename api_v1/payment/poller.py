@@ -0,0 +1,148 @@
+import asyncio
+import logging
+from datetime import datetime
+
+from sqlalchemy import select, update, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from api_v1.payment.crud import refresh_jar_payments
+from core.config import settings
+from core.db_helper import db_helper
+from core.models.jar import Jar
+from core.monobank import monobank_client, token_hash
+
+logger = logging.getLogger(__name__)
+
+# Ключ advisory lock PostgreSQL: опитує лише один воркер, інакше ліміт токена
+# витрачався б кожним процесом окремо
+POLLER_LOCK_KEY = 7_305_112_001
+
+
+class JarPoller:
+    """
+    Фонове опитування виписок зареєстрованих банок.
+
+    Кожного такту для кожного токена, чий ліміт (1 запит / 60 с) вже доступний,
+    опитується банка, яку найдовше не оновлювали. Так банки одного токена
+    по черзі ділять між собою доступний ліміт запитів.
+
+    При кількох воркерах на PostgreSQL опитує лише той, хто тримає advisory lock.
+    Lock тримається на окремому з'єднанні поза пулом запитів і перевіряється кожного такту.
+    """
+
+    def __init__(self, tick_seconds: float):
+        self.tick_seconds = tick_seconds
+        self._task: asyncio.Task | None = None
+        self._lock_engine: AsyncEngine | None = None
+        self._lock_connection: AsyncConnection | None = None
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="jar-poller")
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        await self._release_lock()
+        if self._lock_engine is not None:
+            await self._lock_engine.dispose()
+            self._lock_engine = None
+
+    async def _release_lock(self):
+        if self._lock_connection is None:
+            return
+        try:
+            # Закриття з'єднання звільняє advisory lock
+            await self._lock_connection.close()
+        except Exception:
+            logger.warning("Poller lock connection was already broken")
+        self._lock_connection = None
+
+    @property
+    def lock_engine(self) -> AsyncEngine:
+        # Без пулу: з'єднання з lock не займає місце в пулі запитів воркера
+        if self._lock_engine is None:
+            self._lock_engine = create_async_engine(
+                db_helper.url, poolclass=NullPool, isolation_level="AUTOCOMMIT"
+            )
+        return self._lock_engine
+
+    async def is_leader(self) -> bool:
+        if db_helper.engine.dialect.name != "postgresql":
+            return True
+        if self._lock_connection is not None:
+            try:
+                await self._lock_connection.execute(text("SELECT 1"))
+                return True
+            except Exception:
+                # З'єднання втрачене — lock звільнений, його вже може тримати інший воркер
+                logger.warning("Poller lock connection lost, re-acquiring")
+                await self._release_lock()
+        connection = await self.lock_engine.connect()
+        acquired = (
+            await connection.execute(
+                text("SELECT pg_try_advisory_lock(:key)"), {"key": POLLER_LOCK_KEY}
+            )
+        ).scalar()
+        if acquired:
+            self._lock_connection = connection
+        else:
+            await connection.close()
+        return bool(acquired)
+
+    async def _run(self):
+        while True:
+            try:
+                if await self.is_leader():
+                    await self.poll_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Jar polling failed")
+            await asyncio.sleep(self.tick_seconds)
+
+    async def poll_once(self):
+        async with db_helper.session_factory() as session:
+            stmt = select(Jar).order_by(Jar.polled_at.nulls_first(), Jar.id)
+            jars = (await session.execute(stmt)).scalars().all()
+
+        # Найдавніше опитана банка для кожного токена, чий ліміт вже доступний
+        due: dict[str, Jar] = {}
+        for jar in jars:
+            key = token_hash(jar.monobank_token)
+            if key in due or not monobank_client.statement_limiter.ready(
+                jar.monobank_token
+            ):
+                continue
+            due[key] = jar
+
+        await asyncio.gather(*(self.poll_jar(jar) for jar in due.values()))
+
+    async def poll_jar(self, jar: Jar):
+        try:
+            new_payments = await refresh_jar_payments(
+                monobank_token=jar.monobank_token, jar_id=jar.jar_id
+            )
+            if new_payments:
+                logger.info("Jar %s: %d new payments", jar.jar_id, len(new_payments))
+        except Exception:
+            logger.exception("Jar %s polling failed", jar.jar_id)
+
+        # Банка відходить у кінець черги свого токена навіть після помилки
+        async with db_helper.unit_of_work() as session:
+            stmt = (
+                update(Jar)
+                .where(Jar.id == jar.id)
+                .values(polled_at=datetime.now().timestamp())
+            )
+            await session.execute(stmt)
+
+
+jar_poller = JarPoller(tick_seconds=settings.poller.tick_seconds)
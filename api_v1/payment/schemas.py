@@ -82,9 +82,40 @@ class PaymentOut(BaseModel):
     jar_id: PaymentDescriptionData.jar_id_description
     amount: PaymentDescriptionData.amount_description
     comment: Optional[str] = None
-    time: float
+    # ціле число секунд: дані підписуються (core/receipt_signer.py), а запис float
+    # у JSON різниться між мовами
+    time: int
 
 
 class SignedPaymentOut(BaseModel):
     payment_data: PaymentDetailsOut
     signature: str
+
+
+class JarOut(BaseModel):
+    id: int
+    jar_id: PaymentDescriptionData.jar_id_description
+    polled_at: Optional[float] = None
+
+
+class StatementItem(BaseModel):
+    id: str
+    time: int
+    amount: int
+    description: Optional[str] = None
+    comment: Optional[str] = None
+
+
+class WebhookData(BaseModel):
+    account: str
+    statementItem: StatementItem
+
+
+class WebhookEvent(BaseModel):
+    """
+    Подія webhook. `data` розбирається як WebhookData лише для StatementItem:
+    події інших типів приймаються (200, ignored), а не відхиляються з 422.
+    """
+
+    type: str
+    data: Optional[dict] = None
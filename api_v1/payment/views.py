@@ -1,4 +1,7 @@
-from fastapi import APIRouter, Header
+from typing import Annotated, Optional
+
+import httpx
+from fastapi import APIRouter, Header, Request, HTTPException, status
 from fastapi.params import Query, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -7,20 +10,41 @@ from api_v1.payment.dependencies import (
     return_payment_by_jar_id_mono,
 )
 from core import db_helper
-from core.utils import encode_jwt
+from core.export import ExportFormat, stream_export
+from core.pagination import MAX_PAGE_SIZE, stream_page
+from core.receipt_signer import receipt_signer
 
-from api_v1.order.crud import search_payment
-from api_v1.payment.crud import update_all_jars_payments
-from api_v1.payment.schemas import PaymentSearch, PaymentDescriptionData
-from api_v1.auth import auth_by_operation_token
+from api_v1.payment.crud import (
+    search_payment,
+    update_all_jars_payments,
+    register_jar,
+    unregister_jar,
+    ingest_webhook_event,
+    list_payments_stmt,
+    payment_list_item,
+    export_payments_stmt,
+)
+from api_v1.payment.schemas import (
+    PaymentSearch,
+    PaymentDescriptionData,
+    JarOut,
+    WebhookEvent,
+)
+from api_v1.system.dependencies import register_webhook
+from api_v1.auth import auth_by_operation_token, auth_by_webhook_secret
+from core.config import webhook_secret
 
 router = APIRouter(prefix="/payment", tags=["Payment"], dependencies=[Depends(auth_by_operation_token)])
+# Monobank не надсилає X-Operation-Token, тому webhook має окремий роутер
+webhook_router = APIRouter(
+    prefix="/payment", tags=["Payment"], dependencies=[Depends(auth_by_webhook_secret)]
+)
 
 
 @router.get("/get/by-id")
 async def get_payment_by_innie_id(
     payment_id: PaymentDescriptionData.id_payment_description = Query(...),
-    session: AsyncSession = Depends(db_helper.scoped_session_dependency),
+    session: AsyncSession = Depends(db_helper.session_dependency),
 ):
     return await return_payment_by_id(transaction_id=payment_id, session=session)
 
@@ -28,7 +52,7 @@ async def get_payment_by_innie_id(
 @router.get("/get/by-jar-id-mono")
 async def get_payment_mono_id(
     monobank_payment_id: PaymentDescriptionData.monobank_payment_id_query = Query(...),
-    session: AsyncSession = Depends(db_helper.scoped_session_dependency),
+    session: AsyncSession = Depends(db_helper.session_dependency),
 ):
     """Знайти транзакція за унікальний кодом котрий присвоїв Монобанк"""
     return await return_payment_by_jar_id_mono(
@@ -36,32 +60,166 @@ async def get_payment_mono_id(
     )
 
 
+@router.get("/list")
+async def list_payments(
+    jar_id: Optional[str] = None,
+    time_from: Annotated[Optional[int], Query(description="Unix-час, включно")] = None,
+    time_to: Annotated[Optional[int], Query(description="Unix-час, не включно")] = None,
+    matched: Annotated[
+        Optional[bool], Query(description="true — прив'язані до замовлення, false — вільні")
+    ] = None,
+    cursor: Annotated[
+        Optional[str], Query(description="next_cursor з попередньої сторінки")
+    ] = None,
+    limit: Annotated[int, Query(ge=1, le=MAX_PAGE_SIZE)] = 50,
+):
+    """
+    Список транзакцій реєстру від найновіших. Для наступної сторінки передайте
+    next_cursor з відповіді; null означає останню сторінку.
+    """
+    stmt = list_payments_stmt(
+        cursor=cursor,
+        jar_id=jar_id,
+        time_from=time_from,
+        time_to=time_to,
+        matched=matched,
+    )
+    return stream_page(
+        stmt, limit=limit, position_key="time", serialize=payment_list_item
+    )
+
+
+@router.get("/export")
+async def export_payments(
+    jar_id: Optional[str] = None,
+    time_from: Annotated[Optional[int], Query(description="Unix-час, включно")] = None,
+    time_to: Annotated[Optional[int], Query(description="Unix-час, не включно")] = None,
+    matched: Optional[bool] = None,
+    export_format: Annotated[ExportFormat, Query(alias="format")] = "ndjson",
+    gzip: bool = False,
+):
+    """
+    Повне вивантаження транзакцій реєстру за фільтрами у NDJSON або CSV
+    (gzip=true — стиснуте). Рядки передаються потоком, розмір вивантаження не обмежений.
+    """
+    stmt = export_payments_stmt(
+        jar_id=jar_id, time_from=time_from, time_to=time_to, matched=matched
+    )
+    return stream_export(
+        stmt,
+        filename="payments",
+        export_format=export_format,
+        gzip=gzip,
+        serialize=payment_list_item,
+    )
+
+
 @router.get("/find-payment")
 async def find_payment(
     data: PaymentSearch = Query(),
-    session: AsyncSession = Depends(db_helper.scoped_session_dependency),
+    session: AsyncSession = Depends(db_helper.session_dependency),
 ):
     """
-    Пошук виконаної транзакції серед уже зареєстрованих у реєстрі. <b>ОНОВЛЮЙТЕ РЕГІСТР ВСІХ ТРАНЗАКЦІЙ ПЕРЕД КОЖНИМ ЗАПИТОМ</b>
+    Пошук виконаної транзакції серед уже зареєстрованих у реєстрі.
+    Реєстр зареєстрованих банок оновлюється у фоні (/payment/jar/register).
     """
     data = await search_payment(
         data=data,
         session=session,
     )
 
-    return {"data": data, "signature": await encode_jwt(data)}
+    if receipt_signer.mode == "jwt":
+        return {"data": data, "signature": receipt_signer.sign(data)}
+    return {
+        "data": data,
+        "signature": receipt_signer.sign(data),
+        "alg": receipt_signer.algorithm,
+    }
+
+
+@router.get("/receipt-key")
+async def receipt_verification_key():
+    """
+    Ключ для перевірки підпису результатів /payment/find-payment.
+    Для Ed25519 підпис перевіряється над канонічним JSON поля `data`
+    (відсортовані ключі, без пробілів, UTF-8), підпис у base64url.
+    """
+    return receipt_signer.verification_key()
 
 
 @router.post("/update/existing_payments")
 async def add_new_payments(
     monobank_token: str = Header(),
     jar_id: str = Query(),
-    session: AsyncSession = Depends(db_helper.scoped_session_dependency),
 ):
     """
     Оновити реєстр бази даних усіх транзакцій по банці.
+    Одночасні запити для тієї самої банки виконують одне оновлення і отримують спільний результат.
+    Якщо ліміт виписки токена (1 запит / 60 с) ще не минув у цьому воркері, запит чекає
+    на нього; якщо ліміт вичерпав інший воркер — відповідь 429 з Retry-After.
+    """
+    data = await update_all_jars_payments(monobank_token=monobank_token, jar_id=jar_id)
+    return data
+
+
+@router.post("/jar/register", response_model=JarOut)
+async def jar_register(
+    monobank_token: str = Header(),
+    jar_id: PaymentDescriptionData.jar_id_description = Query(),
+    session: AsyncSession = Depends(db_helper.session_dependency),
+):
+    """
+    Зареєструвати банку для фонового оновлення реєстру транзакцій.
+    <b>Monobank дозволяє один запит виписки на 60 секунд для токена</b>, тому банки
+    одного токена опитуються по черзі.
     """
-    data = await update_all_jars_payments(
+    return await register_jar(
         monobank_token=monobank_token, jar_id=jar_id, session=session
     )
-    return data
+
+
+@router.delete("/jar/unregister")
+async def jar_unregister(
+    jar_id: PaymentDescriptionData.jar_id_description = Query(),
+    session: AsyncSession = Depends(db_helper.session_dependency),
+):
+    """Припинити фонове оновлення реєстру для банки"""
+    return await unregister_jar(jar_id=jar_id, session=session)
+
+
+@router.post("/webhook/register")
+async def webhook_register(
+    request: Request,
+    monobank_token: str = Header(),
+    webhook_url: str | None = Query(
+        None, description="Публічна адреса /payment/webhook, якщо сервіс за проксі"
+    ),
+):
+    """
+    Підписати токен Monobank на надсилання нових транзакцій на /payment/webhook.
+    """
+    if not webhook_secret:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="MONOBANK_WEBHOOK_SECRET is not configured",
+        )
+    url = webhook_url or str(request.url_for("monobank_webhook"))
+    url = str(httpx.URL(url).copy_merge_params({"secret": webhook_secret}))
+    return await register_webhook(token=monobank_token, url=url)
+
+
+@webhook_router.get("/webhook")
+async def monobank_webhook_check():
+    """Monobank перевіряє адресу webhook GET-запитом, очікуючи відповідь 200"""
+    return {"status": "ok"}
+
+
+@webhook_router.post("/webhook", name="monobank_webhook")
+async def monobank_webhook(
+    event: WebhookEvent,
+    session: AsyncSession = Depends(db_helper.session_dependency),
+):
+    """
+    Прийом транзакцій від Monobank: запис у реєстр і миттєве підтвердження замовлення.
+    """
+    return await ingest_webhook_event(event=event, session=session)
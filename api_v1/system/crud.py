@@ -7,6 +7,7 @@ from .schemas import AdminCreate
 from core.enums import AdminPermission
 from .dependencies import check_user_name_availability
 from core.utils import hash_password
+from core.event_bus import PERMISSION_CHANGED, event_bus
 
 
 async def return_permission_by_id(
@@ -30,8 +31,8 @@ async def issue_permission_for_admin(
         admin_id=admin.id,
     )
     session.add(new_permission)
-    await session.commit()
-    await session.refresh(new_permission)
+    await session.flush()
+    await event_bus.publish(session, PERMISSION_CHANGED, {"admin_id": admin.id})
     return new_permission
 
 
@@ -49,9 +50,14 @@ async def get_all_permissions_by_admin(
 
 
 async def delete_permission_for_admin(permission_id: int, session: AsyncSession):
-    stmt = delete(Permission).where(Permission.id == permission_id)
-    await session.execute(stmt)
-    await session.commit()
+    stmt = (
+        delete(Permission)
+        .where(Permission.id == permission_id)
+        .returning(Permission.admin_id)
+    )
+    admin_id = (await session.execute(stmt)).scalar_one_or_none()
+    if admin_id is not None:
+        await event_bus.publish(session, PERMISSION_CHANGED, {"admin_id": admin_id})
     return HTTPException(
         status_code=status.HTTP_204_NO_CONTENT, detail="Permission deleted"
     )
@@ -109,8 +115,7 @@ async def issue_new_admin(data_in: AdminCreate, session: AsyncSession):
         password=hs_pw,
     )
     session.add(new_admin)
-    await session.commit()
-    await session.refresh(new_admin)
+    await session.flush()
     return new_admin
 
 
@@ -128,7 +133,7 @@ async def admin_delete(admin: Admin, session: AsyncSession):
     # Видалення самого адміністратора
     stmt = delete(Admin).where(Admin.id == admin.id)
     await session.execute(stmt)
-    await session.commit()
+    await event_bus.publish(session, PERMISSION_CHANGED, {"admin_id": admin.id})
     return HTTPException(
         status_code=status.HTTP_204_NO_CONTENT,
         detail={
@@ -1,23 +1,41 @@
 import datetime
-import requests
+import httpx
 from fastapi import HTTPException, status
 
-from requests.exceptions import HTTPError
-
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.config import system_token
 from core.enums import AdminPermission
 from core.models.admin import Admin
+from core.monobank import monobank_client, token_hash
+from core.read_through_cache import client_info_cache
+from core.single_flight import statement_flight
+from api_v1.system.permission_cache import permission_cache
+
+# Максимальний дозволений проміжок виписки (31 доба + 1 година)
+MAX_STATEMENT_INTERVAL = 2682000
+# Максимальна кількість транзакцій в одній відповіді виписки
+STATEMENT_PAGE_LIMIT = 500
 
 
 async def validate_action_to_perform(
     required_permission: AdminPermission,
     session: AsyncSession,
-    admin: Admin,
+    admin,
 ):
-    """Надавати доступ після успішної авторизації"""
+    """
+    Надавати доступ після успішної авторизації.
+    Якщо дозволи вже є в токені (AdminClaims.permissions), БД не читається.
+    """
+    permissions = getattr(admin, "permissions", None)
+    if permissions is not None:
+        if required_permission not in permissions:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=f"Permission '{required_permission.name}' not allowed for admin ID {admin.id}",
+            )
+        return True
     await check_permission_to_perform(
         admin_id=admin.id, permission=required_permission, session=session
     )
@@ -25,20 +43,34 @@ async def validate_action_to_perform(
 
 
 
+async def get_permission_set(
+    admin_id: int, session: AsyncSession
+) -> frozenset[AdminPermission]:
+    """Дозволи адміністратора з кешу, при промаху кешу — з бази даних"""
+    from api_v1.system.crud import get_all_permissions_by_admin
+
+    permissions = permission_cache.get(admin_id)
+    if permissions is None:
+        # зміна дозволів під час читання не повинна лишити в кеші старий набір
+        generation = permission_cache.generation(admin_id)
+        personal_permissions = await get_all_permissions_by_admin(
+            admin_id=admin_id, session=session
+        )
+        permissions = permission_cache.set(
+            admin_id,
+            (p.permission_type for p in personal_permissions),
+            generation=generation,
+        )
+    return permissions
+
+
 async def check_permission_to_perform(
     admin_id: int, permission: AdminPermission, session: AsyncSession
 ) -> bool:
     """Перевірити чи є в адміністратора дозвіл на виконання цієї дії"""
-    from api_v1.system.crud import get_all_permissions_by_admin
+    personal_permissions = await get_permission_set(admin_id=admin_id, session=session)
 
-    personal_permissions = await get_all_permissions_by_admin(
-        admin_id=admin_id, session=session
-    )
-
-    permission_exists = any(
-        p.permission_type == permission for p in personal_permissions
-    )
-    if not permission_exists:
+    if permission not in personal_permissions:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail=f"Permission '{permission.name}' not allowed for admin ID {admin_id}",
@@ -52,26 +84,37 @@ async def protect_same_permission(
     """
     Checks if the given permission is already assigned.
     """
-    from api_v1.system.crud import get_all_permissions_by_admin
-
-    all_permissions = await get_all_permissions_by_admin(
-        admin_id=admin_id, session=session
-    )
-
-    permission_exists = any(p.permission_type == permission for p in all_permissions)
+    all_permissions = await get_permission_set(admin_id=admin_id, session=session)
 
-    if permission_exists:
+    if permission in all_permissions:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail=f"Permission '{permission.name}' already exists for admin ID {admin_id}. Duplication avoided.",)
 
 
 async def request_info_about_client(token: str):
-    api = requests.get(
-        "https://api.monobank.ua/personal/client-info", headers={"X-Token": token}
-    ).json()
-    print("MONO API CALL")
-    return api
+    """
+    Інформація про клієнта (рахунки, банки) з кешу на час ліміту Monobank
+    (1 запит / 60 с). Одночасні запити з тим самим токеном чекають один виклик API,
+    а при помилці API віддається остання отримана відповідь.
+    """
+
+    async def fetch():
+        api = await monobank_client.client_info(token=token)
+        print("MONO API CALL")
+        return api
+
+    return await client_info_cache.get(token_hash(token), fetch)
+
+
+async def register_webhook(token: str, url: str):
+    """
+    Встановити webhook для токена. Monobank перевіряє URL GET-запитом,
+    тому ендпоінт має бути доступний до виклику.
+    """
+    await monobank_client.set_webhook(token=token, url=url)
+    print("MONO API CALL WEBHOOK")
+    return {"webhook_url": url}
 
 
 async def check_user_name_availability(user_name: str, session: AsyncSession) -> bool:
@@ -114,11 +157,8 @@ async def request_jar_info(api_token, jar_id, from_time=None, to_time=None):
 
     Викидає:
     ValueError -- при некоректному проміжку часу
-    HTTPError -- при помилці запиту до API
+    httpx.HTTPStatusError -- при помилці запиту до API
     """
-    # Максимальний дозволений проміжок (31 доба + 1 година)
-    max_interval = 2682000
-
     # Значення за замовчуванням для часових меж
     if from_time is None:
         from_time = get_one_month_ago()
@@ -134,22 +174,26 @@ async def request_jar_info(api_token, jar_id, from_time=None, to_time=None):
     to_time = int(to_time)
 
     # Корекція проміжку, якщо він перевищує ліміт
-    actual_to = min(to_time, from_time + max_interval)
-
-    url = f"https://api.monobank.ua/personal/statement/{jar_id}/{from_time}/{actual_to}"
+    actual_to = min(to_time, from_time + MAX_STATEMENT_INTERVAL)
 
     try:
-        response = requests.get(url, headers={"X-Token": api_token})
-        response.raise_for_status()  # Перевірка статусу відповіді
+        # однакові одночасні запити виписки об'єднуються в один виклик API
+        transactions = await statement_flight.do(
+            (token_hash(api_token), jar_id, (from_time, actual_to)),
+            lambda: monobank_client.statement(
+                token=api_token, account=jar_id, from_time=from_time, to_time=actual_to
+            ),
+        )
 
         print(f"MONO API CALL JAR: {jar_id} ({from_time} - {actual_to})")
-        return response.json()
+        return transactions
 
-    except HTTPError as http_err:
+    except httpx.HTTPStatusError as http_err:
         # Додатковий вивід інформації про помилку
+        response = http_err.response
         error_details = {
             "status_code": response.status_code,
-            "url": response.url,
+            "url": str(response.url),
             "response": response.text[:500],  # Перші 500 символів відповіді
         }
         print(f"HTTP помилка: {http_err}\nДеталі: {error_details}")
@@ -0,0 +1,87 @@
+import time
+
+from core.config import settings
+from core.enums import AdminPermission
+
+
+# Порядок бітів — порядок оголошення AdminPermission; нові дозволи додавати в кінець
+_PERMISSION_BITS = {permission: 1 << index for index, permission in enumerate(AdminPermission)}
+
+
+def encode_permissions(permissions) -> int:
+    """Бітова маска дозволів для claim `perm` в access-токені"""
+    mask = 0
+    for permission in permissions:
+        mask |= _PERMISSION_BITS[permission]
+    return mask
+
+
+def decode_permissions(mask: int) -> frozenset[AdminPermission]:
+    return frozenset(
+        permission for permission, bit in _PERMISSION_BITS.items() if mask & bit
+    )
+
+
+class PermissionCache:
+    """
+    Кеш дозволів адміністраторів: admin_id -> frozenset[AdminPermission].
+    Записи живуть `ttl` секунд і явно скидаються при видачі чи видаленні дозволу
+    та видаленні адміністратора. Кожне скидання збільшує покоління адміністратора:
+    дозволи, прочитані з бази до скидання, `set` вже не кешує.
+
+    Також веде список відкликань для дозволів, вбудованих у токен: токен, виданий до
+    останньої зміни дозволів адміністратора (або до старту процесу), вважається застарілим.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._entries: dict[int, tuple[float, frozenset[AdminPermission]]] = {}
+        self._changed_at: dict[int, float] = {}
+        self._started_at = time.time()
+        self._generations: dict[int, int] = {}
+        self._epoch = 0  # скидання всього кешу
+
+    def get(self, admin_id: int) -> frozenset[AdminPermission] | None:
+        entry = self._entries.get(admin_id)
+        if entry is None:
+            return None
+        expires_at, permissions = entry
+        if expires_at < time.monotonic():
+            del self._entries[admin_id]
+            return None
+        return permissions
+
+    def generation(self, admin_id: int) -> int:
+        """Покоління дозволів адміністратора; береться до читання з бази"""
+        return self._epoch + self._generations.get(admin_id, 0)
+
+    def set(
+        self, admin_id: int, permissions, generation: int | None = None
+    ) -> frozenset[AdminPermission]:
+        """
+        Закешувати дозволи. Якщо передано `generation` і дозволи відтоді скидалися,
+        прочитане значення могло застаріти — воно повертається, але не кешується.
+        """
+        permissions = frozenset(permissions)
+        if generation is None or generation == self.generation(admin_id):
+            self._entries[admin_id] = (time.monotonic() + self.ttl, permissions)
+        return permissions
+
+    def invalidate(self, admin_id: int | None = None):
+        """Скинути дозволи адміністратора (або всіх, якщо admin_id не вказано)"""
+        if admin_id is None:
+            self._entries.clear()
+            self._started_at = time.time()
+            self._epoch += 1
+        else:
+            self._entries.pop(admin_id, None)
+            self._changed_at[admin_id] = time.time()
+            self._generations[admin_id] = self._generations.get(admin_id, 0) + 1
+
+    def is_token_current(self, admin_id: int, issued_at: float) -> bool:
+        """Чи можна довіряти дозволам, вбудованим у токен, виданий в `issued_at`"""
+        revoked_before = max(self._changed_at.get(admin_id, 0.0), self._started_at)
+        return issued_at > revoked_before
+
+
+permission_cache = PermissionCache(ttl=settings.permission_cache_ttl)
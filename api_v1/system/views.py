@@ -5,9 +5,12 @@ from fastapi.params import Header, Path, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 
-from api_v1.auth import get_current_admin, auth_by_operation_token
+from api_v1.auth import (
+    get_current_admin_claims,
+    auth_by_operation_token,
+    AdminClaims,
+)
 
-from core import Admin
 from core.db_helper import db_helper
 from core.enums import (
     AdminPermission,
@@ -54,7 +57,7 @@ permission_router = APIRouter(
     description="Returns status=ok if a simple SELECT 1 against the database succeeds.",
 )
 async def db_health(
-    session: AsyncSession = Depends(db_helper.scoped_session_dependency),
+    session: AsyncSession = Depends(db_helper.session_dependency),
 ):
     try:
         result = await session.execute(text("SELECT 1"))
@@ -74,8 +77,8 @@ async def db_health(
 )
 async def create_admin(
     data_in: AdminCreate,
-    session: AsyncSession = Depends(db_helper.scoped_session_dependency),
-    admin: Admin = Depends(get_current_admin),
+    session: AsyncSession = Depends(db_helper.session_dependency),
+    admin: AdminClaims = Depends(get_current_admin_claims),
 ):
     """
     Функція створює адміністратора, який зможе керувати інституціями
@@ -100,7 +103,7 @@ async def create_admin_by_system(
         str, Header(description="Токен доступу отриманий від адміністрації системи")
     ],
     data_in: AdminCreate,
-    session: AsyncSession = Depends(db_helper.scoped_session_dependency),
+    session: AsyncSession = Depends(db_helper.session_dependency),
 ):
     # Перевірка, що токен є правильним.
     await check_system_token_to_auth(
@@ -114,8 +117,8 @@ async def create_admin_by_system(
 )
 async def get_admin_info(
     admin_id: int,
-    session: AsyncSession = Depends(db_helper.scoped_session_dependency),
-    admin: Admin = Depends(get_current_admin),
+    session: AsyncSession = Depends(db_helper.session_dependency),
+    admin: AdminClaims = Depends(get_current_admin_claims),
 ):
     """
     Дані що знайшлися про адміністратора з таким ID
@@ -135,8 +138,8 @@ async def delete_admin_by_id(
     admin_id: Annotated[
         int, Query(description="Унікальний ідентифікатор користувача", gt=0)
     ],
-    session: AsyncSession = Depends(db_helper.scoped_session_dependency),
-    admin: Admin = Depends(get_current_admin),
+    session: AsyncSession = Depends(db_helper.session_dependency),
+    admin: AdminClaims = Depends(get_current_admin_claims),
 ):
     """Видалити адміністратора за ID"""
     # Перевірка наявності дозволу видалення адміністратора
@@ -162,8 +165,8 @@ async def delete_admin_by_id(
 async def issue_new_permission(
     admin_id: int,
     permission_type: AdminPermission,
-    session: AsyncSession = Depends(db_helper.scoped_session_dependency),
-    admin: Admin = Depends(get_current_admin),
+    session: AsyncSession = Depends(db_helper.session_dependency),
+    admin: AdminClaims = Depends(get_current_admin_claims),
 ):
     """
     Випуск нового дозволу для адміністратора.
@@ -191,7 +194,7 @@ async def issue_permission_by_system(
     system_token: str,
     admin_id: int,
     permission_type: AdminPermission,
-    session: AsyncSession = Depends(db_helper.scoped_session_dependency),
+    session: AsyncSession = Depends(db_helper.session_dependency),
 ):
     # 1 - Перевірка, що токен є правильним
     await check_system_token_to_auth(token=system_token)
@@ -207,8 +210,8 @@ async def issue_permission_by_system(
 
 @admin_router.get("/my/all_permissions")
 async def get_my_permissions(
-    session: AsyncSession = Depends(db_helper.scoped_session_dependency),
-    admin: Admin = Depends(get_current_admin),
+    session: AsyncSession = Depends(db_helper.session_dependency),
+    admin: AdminClaims = Depends(get_current_admin_claims),
 ):
     """Повернути всі дозволи, які закріплені за адміністратором"""
     return await get_all_permissions_by_admin(admin_id=admin.id, session=session)
@@ -217,8 +220,8 @@ async def get_my_permissions(
 @permission_router.get("/{permission_id}")
 async def permission_by_id(
     permission_id: int,
-    session: AsyncSession = Depends(db_helper.scoped_session_dependency),
-    admin: Admin = Depends(get_current_admin),
+    session: AsyncSession = Depends(db_helper.session_dependency),
+    admin: AdminClaims = Depends(get_current_admin_claims),
 ):
     await validate_action_to_perform(
         admin=admin,
@@ -237,8 +240,8 @@ async def permission_by_id(
 )
 async def get_all_permissions(
     admin_id: int,
-    session: AsyncSession = Depends(db_helper.scoped_session_dependency),
-    admin: Admin = Depends(get_current_admin),
+    session: AsyncSession = Depends(db_helper.session_dependency),
+    admin: AdminClaims = Depends(get_current_admin_claims),
 ):
     await validate_action_to_perform(
         AdminPermission.read_other_permission, session=session, admin=admin
@@ -250,8 +253,8 @@ async def get_all_permissions(
 @permission_router.delete("/delete", summary="Видалити дозвіл")
 async def permission_delete(
     permission_id: int,
-    session: AsyncSession = Depends(db_helper.scoped_session_dependency),
-    admin: Admin = Depends(get_current_admin),
+    session: AsyncSession = Depends(db_helper.session_dependency),
+    admin: AdminClaims = Depends(get_current_admin_claims),
 ):
     """
     Видалення дозволу певного дозволу для певного адміністратора
@@ -0,0 +1,62 @@
+"""
+Скільки викликів client-info доходить до Monobank, коли дашборди часто
+оновлюються: --callers одночасних запитів кожні --interval секунд.
+Виклик API імітується затримкою --latency; кожен другий виклик після першого
+завершується 429, як при вичерпаному ліміті.
+
+    python -m benchmarks.bench_client_info_cache --callers 50 --rounds 5
+"""
+
+import argparse
+import asyncio
+import time
+
+import httpx
+
+from core.read_through_cache import ReadThroughCache
+
+
+async def main(callers: int, rounds: int, interval: float, latency: float):
+    upstream_calls = 0
+    errors = 0
+
+    async def fetch():
+        nonlocal upstream_calls
+        upstream_calls += 1
+        await asyncio.sleep(latency)
+        if upstream_calls > 1 and upstream_calls % 2 == 0:
+            request = httpx.Request("GET", "https://api.monobank.ua/personal/client-info")
+            raise httpx.HTTPStatusError(
+                "429", request=request, response=httpx.Response(429, request=request)
+            )
+        return {"jars": [{"id": "bench-jar"}]}
+
+    # TTL коротший за інтервал, щоб кожен раунд оновлював значення
+    cache = ReadThroughCache(ttl=interval / 2, stale_ttl=3600, stale_on=(httpx.HTTPError,))
+
+    async def caller():
+        nonlocal errors
+        try:
+            await cache.get("token-hash", fetch)
+        except httpx.HTTPError:
+            errors += 1
+
+    started = time.perf_counter()
+    for _ in range(rounds):
+        await asyncio.gather(*(caller() for _ in range(callers)))
+        await asyncio.sleep(interval)
+    elapsed = time.perf_counter() - started
+    print(
+        f"{callers * rounds} requests, {upstream_calls} upstream calls, "
+        f"{errors} errors, {elapsed:.2f} s"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--callers", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--interval", type=float, default=0.2)
+    parser.add_argument("--latency", type=float, default=0.05)
+    args = parser.parse_args()
+    asyncio.run(main(args.callers, args.rounds, args.interval, args.latency))
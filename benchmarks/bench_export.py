@@ -0,0 +1,82 @@
+"""
+Потокове вивантаження транзакцій (/payment/export): час і пікова пам'ять
+для NDJSON, CSV та CSV+gzip. Пам'ять має лишатися сталою зі зростанням --rows.
+
+    python -m benchmarks.bench_export --rows 1000000
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+_tmp = tempfile.TemporaryDirectory()
+# db_helper читає DATABASE_URL при імпорті core
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{Path(_tmp.name) / 'bench.db'}"
+
+from sqlalchemy import insert  # noqa: E402
+
+from api_v1.payment.crud import export_payments_stmt, payment_list_item  # noqa: E402
+from core import Base, Payment, db_helper  # noqa: E402
+from core.export import stream_export  # noqa: E402
+
+
+async def seed(rows: int, chunk: int = 50_000):
+    now = int(time.time())
+    async with db_helper.engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        for start in range(0, rows, chunk):
+            await conn.execute(
+                insert(Payment),
+                [
+                    dict(
+                        jar_id="bench-jar",
+                        monobank_transaction_id=f"bench-{i:09d}",
+                        amount=100 + i % 1000,
+                        comment=f"order {i}",
+                        time=now - rows + i,
+                    )
+                    for i in range(start, min(start + chunk, rows))
+                ],
+            )
+
+
+async def run(label: str, export_format: str, gzip: bool):
+    response = stream_export(
+        export_payments_stmt(jar_id="bench-jar"),
+        filename="payments",
+        export_format=export_format,
+        gzip=gzip,
+        serialize=payment_list_item,
+    )
+    tracemalloc.start()
+    started = time.perf_counter()
+    size = 0
+    async for chunk in response.body_iterator:
+        size += len(chunk)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"{label:<10} {elapsed:7.2f} s  {size / 2**20:8.1f} MiB out"
+        f"  peak {peak / 2**20:6.1f} MiB"
+    )
+
+
+async def main(rows: int):
+    await seed(rows)
+    print(f"{rows} rows")
+    await run("ndjson", "ndjson", False)
+    await run("csv", "csv", False)
+    await run("csv+gzip", "csv", True)
+    await db_helper.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=200_000)
+    asyncio.run(main(parser.parse_args().rows))
+    _tmp.cleanup()
@@ -0,0 +1,62 @@
+"""
+Бюджет часу холодного імпорту `main`. Завершується з кодом 1, якщо імпорт
+перевищує поріг або під час імпорту відкривається будь-який файл ключа
+(*.pem, *.key). Той самий бюджет перевіряє tests/test_import_time.py.
+
+    python -m benchmarks.bench_import_time --budget 2.0
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+
+PROBE = """
+import json, sys, time
+opened = []
+def hook(event, args):
+    if event == "open" and str(args[0]).endswith((".pem", ".key")):
+        opened.append(str(args[0]))
+sys.addaudithook(hook)
+started = time.perf_counter()
+import main
+print(json.dumps({"seconds": time.perf_counter() - started, "keys_opened": opened}))
+"""
+
+
+def measure() -> dict:
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main(budget: float, runs: int) -> int:
+    results = [measure() for _ in range(runs)]
+    best = min(result["seconds"] for result in results)
+    keys_opened = sorted({path for result in results for path in result["keys_opened"]})
+    print(f"cold import of main: best {best * 1000:.0f} ms of {runs} (budget {budget * 1000:.0f} ms)")
+
+    failed = False
+    if best > budget:
+        print("FAIL: import time budget exceeded")
+        failed = True
+    if keys_opened:
+        print(f"FAIL: key files read at import time: {keys_opened}")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--budget", type=float, default=2.0, help="seconds")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+    sys.exit(main(args.budget, args.runs))
@@ -0,0 +1,75 @@
+"""
+Пропускна здатність підпису та перевірки JWT: PEM-текст на кожен виклик (як раніше)
+проти JWTService з розібраними ключами та кешем перевірених токенів.
+
+    python -m benchmarks.bench_jwt --iterations 2000
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import jwt
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from core.jwt_service import JWTService
+
+PAYLOAD = {"sub": "1", "user_name": "bench"}
+
+
+def throughput(label: str, iterations: int, func) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    elapsed = time.perf_counter() - started
+    rate = iterations / elapsed
+    print(f"{label:<28} {rate:10.0f} ops/s")
+    return rate
+
+
+def main(iterations: int):
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private_pem = key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+    public_pem = key.public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+    )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        private_path = Path(tmp) / "jwt-private.pem"
+        public_path = Path(tmp) / "jwt-public.pem"
+        private_path.write_bytes(private_pem)
+        public_path.write_bytes(public_pem)
+        service = JWTService(private_path, public_path, algorithm="RS256")
+
+        private_text = private_pem.decode()
+        public_text = public_pem.decode()
+        token = service.encode(PAYLOAD)
+
+        throughput(
+            "sign, PEM per call",
+            iterations,
+            lambda: jwt.encode(PAYLOAD, private_text, algorithm="RS256"),
+        )
+        throughput("sign, JWTService", iterations, lambda: service.encode(PAYLOAD))
+        throughput(
+            "verify, PEM per call",
+            iterations,
+            lambda: jwt.decode(token, public_text, algorithms=["RS256"]),
+        )
+        throughput(
+            "verify, JWTService (cached)",
+            iterations,
+            lambda: service.decode(token),
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=2000)
+    main(parser.parse_args().iterations)
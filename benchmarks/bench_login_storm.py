@@ -0,0 +1,67 @@
+"""
+Затримка інших запитів під час «шторму» логінів: bcrypt прямо в event loop
+проти bcrypt у PasswordHasher.
+
+Замість /order/confirm вимірюється легка корутина-проба, яка, як і обробник
+запиту, чекає на event loop; її p99 — це додаткова затримка будь-якого ендпоінту.
+
+    python -m benchmarks.bench_login_storm --logins 40
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import bcrypt
+
+from core.password_pool import PasswordHasher
+
+PASSWORD = b"correct horse battery staple"
+
+
+async def probe(latencies: list[float], stop: asyncio.Event, interval: float = 0.005):
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        latencies.append(time.perf_counter() - started - interval)
+
+
+async def blocking_check(hashed: bytes):
+    return bcrypt.checkpw(PASSWORD, hashed)
+
+
+async def run(label: str, logins: int, check) -> None:
+    latencies: list[float] = []
+    stop = asyncio.Event()
+    probe_task = asyncio.create_task(probe(latencies, stop))
+    started = time.perf_counter()
+    results = await asyncio.gather(*(check() for _ in range(logins)), return_exceptions=True)
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await probe_task
+
+    shed = sum(isinstance(result, Exception) for result in results)
+    p50 = statistics.median(latencies) * 1000
+    p99 = statistics.quantiles(latencies, n=100)[98] * 1000 if len(latencies) > 1 else float("nan")
+    print(
+        f"{label:<10} logins={logins} shed={shed} total={elapsed:.2f}s "
+        f"probe p50={p50:.1f} ms p99={p99:.1f} ms"
+    )
+
+
+async def main(logins: int, rounds: int):
+    hashed = bcrypt.hashpw(PASSWORD, bcrypt.gensalt(rounds))
+    hasher = PasswordHasher(max_workers=2, max_pending=logins, rounds=rounds)
+
+    await run("in-loop", logins, lambda: blocking_check(hashed))
+    await run("pool", logins, lambda: hasher.check(PASSWORD, hashed))
+    hasher.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--logins", type=int, default=40)
+    parser.add_argument("--rounds", type=int, default=12)
+    args = parser.parse_args()
+    asyncio.run(main(args.logins, args.rounds))
@@ -0,0 +1,123 @@
+"""
+Кількість комітів і час підтвердження замовлення (/order/confirm):
+- legacy — попередній шлях: коміт і refresh після зміни статусу, прив'язки
+  транзакції та оновлення замовлення;
+- unit of work — validate_order з блокуванням рядків і одним комітом.
+
+    python -m benchmarks.bench_order_confirmation --orders 500
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from api_v1.order.crud import return_order_by_id, validate_order
+from api_v1.payment.crud import search_payment
+from api_v1.payment.dependencies import return_payment_by_id
+from api_v1.payment.schemas import PaymentSearch
+from core import Base
+from core.db_helper import DatabaseHelper
+from core.models.order import Order, OrderStatus
+from core.models.payment import Payment
+
+commits = 0
+
+
+def count_commit(session):
+    global commits
+    commits += 1
+
+
+async def seed(helper: DatabaseHelper, orders: int) -> list[int]:
+    now = time.time()
+    async with helper.engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with helper.unit_of_work() as session:
+        created = [
+            Order(
+                jar_id="bench-jar",
+                amount=100 + i,
+                comment=f"order {i}",
+                timestamp=now - 60,
+                status=OrderStatus.created,
+            )
+            for i in range(orders)
+        ]
+        session.add_all(created)
+        session.add_all(
+            Payment(
+                jar_id="bench-jar",
+                monobank_transaction_id=f"bench-{i:08d}",
+                amount=100 + i,
+                comment=f"order {i}",
+                time=int(now),
+            )
+            for i in range(orders)
+        )
+        await session.flush()
+        return [order.id for order in created]
+
+
+async def legacy_confirm(helper: DatabaseHelper, order_id: int):
+    async with helper.session_factory() as session:
+        order = await return_order_by_id(order_id, session)
+        found = await search_payment(
+            data=PaymentSearch(
+                jar_id=order.jar_id, amount=order.amount, comment=order.comment
+            ),
+            session=session,
+            unclaimed_only=True,
+        )
+        transaction = await return_payment_by_id(found["id"], session)
+
+        order.status = OrderStatus.paid
+        await session.commit()
+        await session.refresh(order)
+
+        transaction.order_id = order.id
+        await session.commit()
+        await session.refresh(transaction)
+
+        session.add(order)
+        await session.commit()
+        await session.refresh(order)
+
+
+async def unit_of_work_confirm(helper: DatabaseHelper, order_id: int):
+    async with helper.unit_of_work() as session:
+        order = await return_order_by_id(order_id, session, for_update=True)
+        await validate_order(session=session, order=order)
+
+
+async def run(label: str, orders: int, confirm) -> None:
+    global commits
+    with tempfile.TemporaryDirectory() as tmp:
+        helper = DatabaseHelper(url=f"sqlite+aiosqlite:///{Path(tmp) / 'bench.db'}")
+        order_ids = await seed(helper, orders)
+        commits = 0
+        started = time.perf_counter()
+        for order_id in order_ids:
+            await confirm(helper, order_id)
+        elapsed = time.perf_counter() - started
+        await helper.dispose()
+    print(
+        f"{label:<14} {commits / orders:4.1f} commits/confirm"
+        f"  {elapsed / orders * 1000:7.2f} ms/confirm"
+    )
+
+
+async def main(orders: int):
+    event.listen(Session, "after_commit", count_commit)
+    await run("legacy", orders, legacy_confirm)
+    await run("unit of work", orders, unit_of_work_confirm)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--orders", type=int, default=500)
+    asyncio.run(main(parser.parse_args().orders))
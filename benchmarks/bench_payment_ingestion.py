@@ -0,0 +1,74 @@
+"""
+Порівняння поштучного (add_payment_if_not_exists) та пакетного (add_payments_bulk)
+додавання виписки банки в реєстр платежів.
+
+    python -m benchmarks.bench_payment_ingestion --rows 500
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from api_v1.payment.dependencies import add_payment_if_not_exists, add_payments_bulk
+from api_v1.payment.schemas import CreatePaymentJarRecord
+from core import Base
+
+
+def make_records(rows: int, jar_id: str = "bench-jar") -> list[CreatePaymentJarRecord]:
+    now = int(time.time())
+    return [
+        CreatePaymentJarRecord(
+            jar_id=jar_id,
+            id=f"bench-{i:08d}",
+            amount=100 + i,
+            comment=f"order {i}",
+            time=now - i,
+        )
+        for i in range(rows)
+    ]
+
+
+async def run(label: str, rows: int, ingest) -> float:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{Path(tmp) / 'bench.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        factory = async_sessionmaker(engine, expire_on_commit=False)
+        records = make_records(rows)
+
+        async with factory() as session:
+            started = time.perf_counter()
+            await ingest(records, session)
+            elapsed = time.perf_counter() - started
+        await engine.dispose()
+
+    print(f"{label:<10} {rows:>6} rows  {elapsed * 1000:9.1f} ms")
+    return elapsed
+
+
+async def per_row(records, session):
+    # коміт на кожну транзакцію, як було до пакетного запису
+    for record in records:
+        await add_payment_if_not_exists(record, session)
+        await session.commit()
+
+
+async def bulk(records, session):
+    await add_payments_bulk(records, session)
+    await session.commit()
+
+
+async def main(rows: int):
+    loop_time = await run("per-row", rows, per_row)
+    bulk_time = await run("bulk", rows, bulk)
+    print(f"speedup    x{loop_time / bulk_time:.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=500)
+    asyncio.run(main(parser.parse_args().rows))
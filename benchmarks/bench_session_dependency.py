@@ -0,0 +1,62 @@
+"""
+Накладні витрати на запит для двох стилів сесії:
+- scoped — новий async_scoped_session (scopefunc=current_task) на кожен запит,
+  close() + remove() у finally (попередній scoped_session_dependency);
+- unit of work — звичайна сесія з фабрики та один коміт наприкінці (session_dependency).
+
+    python -m benchmarks.bench_session_dependency --requests 2000
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+from asyncio import current_task
+from pathlib import Path
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_scoped_session
+
+from core.db_helper import DatabaseHelper
+
+
+async def scoped_request(helper: DatabaseHelper):
+    session = async_scoped_session(
+        session_factory=helper.session_factory, scopefunc=current_task
+    )
+    try:
+        await session.execute(text("SELECT 1"))
+        await session.commit()
+    finally:
+        await session.close()
+        await session.remove()
+
+
+async def unit_of_work_request(helper: DatabaseHelper):
+    async with helper.unit_of_work() as session:
+        await session.execute(text("SELECT 1"))
+
+
+async def run(label: str, requests: int, helper: DatabaseHelper, handler) -> None:
+    # Кожен «запит» — окрема задача, як і в uvicorn
+    started = time.perf_counter()
+    for _ in range(requests):
+        await asyncio.create_task(handler(helper))
+    elapsed = time.perf_counter() - started
+    print(f"{label:<14} {elapsed / requests * 1e6:8.1f} us/request")
+
+
+async def main(requests: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        helper = DatabaseHelper(url=f"sqlite+aiosqlite:///{Path(tmp) / 'bench.db'}")
+        # прогрів пулу
+        await unit_of_work_request(helper)
+        await run("scoped", requests, helper, scoped_request)
+        await run("unit of work", requests, helper, unit_of_work_request)
+        await helper.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000)
+    asyncio.run(main(parser.parse_args().requests))
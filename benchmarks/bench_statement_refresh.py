@@ -0,0 +1,47 @@
+"""
+Сплеск одночасних оновлень однієї банки (/payment/update/existing_payments):
+скільки разів виконується запит виписки та внесення в реєстр без об'єднання
+та через SingleFlight. Виклик API та запис імітуються затримкою --latency.
+
+    python -m benchmarks.bench_statement_refresh --callers 20
+"""
+
+import argparse
+import asyncio
+import time
+
+from core.single_flight import SingleFlight
+
+
+async def main(callers: int, latency: float):
+    calls = 0
+
+    async def refresh():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(latency)
+        return ["payment"] * 10
+
+    async def burst(label: str, call):
+        nonlocal calls
+        calls = 0
+        started = time.perf_counter()
+        results = await asyncio.gather(*(call() for _ in range(callers)))
+        elapsed = time.perf_counter() - started
+        shared = all(result is results[0] for result in results)
+        print(
+            f"{label:<14} {callers} callers  {calls:3d} upstream refreshes"
+            f"  {elapsed * 1000:7.1f} ms  same result: {shared}"
+        )
+
+    flight = SingleFlight()
+    await burst("independent", refresh)
+    await burst("single-flight", lambda: flight.do(("token-hash", "jar", None), refresh))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--callers", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.3)
+    args = parser.parse_args()
+    asyncio.run(main(args.callers, args.latency))
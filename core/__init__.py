@@ -5,6 +5,10 @@ __all__ = (
     "Order",
     "Admin",
     "Permission",
+    "Payment",
+    "Jar",
+    "JarSyncState",
+    "BackfillJob",
 )
 
 from core.base import Base
@@ -13,3 +17,4 @@ from core.models.order import Order
 from core.models.admin import Admin
 from core.models.payment import Payment
 from core.models.permission import Permission
+from core.models.jar import Jar, JarSyncState, BackfillJob
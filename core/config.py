@@ -1,5 +1,5 @@
 from pathlib import Path
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from pydantic_settings import BaseSettings
 import os
 from dotenv import load_dotenv
@@ -15,6 +15,9 @@ system_token = os.getenv(
 )  # token for creation admin from the name of a system
 service_token = os.getenv("SERVICE_TOKEN")  # token for another API system
 operation_token = os.getenv("OPERATION_TOKEN")  # token for simple operation auth
+webhook_secret = os.getenv(
+    "MONOBANK_WEBHOOK_SECRET"
+)  # secret query parameter of the URL registered as Monobank webhook
 
 
 def _normalize_database_url(url: str | None) -> str:
@@ -92,8 +95,51 @@ def _normalize_database_url(url: str | None) -> str:
 
 
 class DbSettings(BaseModel):
-    url: str = _normalize_database_url(os.getenv("DATABASE_URL"))
+    # computed when settings are instantiated, not when the class is defined
+    url: str = Field(
+        default_factory=lambda: _normalize_database_url(os.getenv("DATABASE_URL"))
+    )
     echo: bool = False
+    # per-worker pool; the production launcher (serve.py) sizes these from max_connections
+    pool_size: int = int(os.getenv("DB_POOL_SIZE", 5))
+    max_overflow: int = int(os.getenv("DB_MAX_OVERFLOW", 10))
+    pool_timeout: float = float(os.getenv("DB_POOL_TIMEOUT", 30))
+    # connections this service may hold in total (keep below PostgreSQL max_connections)
+    max_connections: int = int(os.getenv("DB_MAX_CONNECTIONS", 80))
+
+
+class MonobankSettings(BaseModel):
+    api_url: str = "https://api.monobank.ua"
+    timeout: float = float(os.getenv("MONOBANK_TIMEOUT", 15))  # seconds per request
+    connect_timeout: float = float(os.getenv("MONOBANK_CONNECT_TIMEOUT", 5))
+    max_connections: int = 20
+    max_keepalive_connections: int = 10
+    keepalive_expiry: float = 30.0
+    http2: bool = True  # used only when the `h2` package is installed
+    statement_interval: float = 60.0  # one statement request per token per minute
+    # incremental sync re-reads this many seconds before the last ingested transaction
+    sync_overlap_seconds: int = int(os.getenv("MONOBANK_SYNC_OVERLAP", 3600))
+    # client-info is limited to one request per 60 s per token; cached for that long
+    client_info_ttl: float = float(os.getenv("MONOBANK_CLIENT_INFO_TTL", 60))
+    # Fernet key that encrypts stored jar tokens (see core/token_cipher.py)
+    token_key: str | None = os.getenv("MONOBANK_TOKEN_KEY")
+    token_key_path: Path = BASE_DIR / "certs" / "monobank-token.key"
+    # last known client-info is served for this long when Monobank fails (e.g. 429)
+    client_info_stale_seconds: float = float(
+        os.getenv("MONOBANK_CLIENT_INFO_STALE", 3600)
+    )
+
+
+class PollerSettings(BaseModel):
+    enabled: bool = os.getenv("JAR_POLLER_ENABLED", "1") != "0"
+    tick_seconds: float = float(os.getenv("JAR_POLLER_TICK", 5))
+
+
+class PasswordSettings(BaseModel):
+    bcrypt_rounds: int = int(os.getenv("BCRYPT_ROUNDS", 12))  # cost factor
+    max_workers: int = int(os.getenv("PASSWORD_WORKERS", 2))
+    # password operations allowed in flight before logins are shed with 503
+    max_pending: int = int(os.getenv("PASSWORD_MAX_PENDING", 32))
 
 
 class AuthJWT(BaseModel):
@@ -102,12 +148,28 @@ class AuthJWT(BaseModel):
     algorithm: str = "RS256"
     access_token_expire_minutes: int = 30
     refresh_token_expire_minutes: int = 60 * 24 * 14
+    verified_cache_size: int = 1024  # recently verified tokens kept to skip RSA verify
+    # embed a permission bitmask into access tokens to authorize without DB reads
+    embed_permissions: bool = os.getenv("JWT_EMBED_PERMISSIONS", "0") == "1"
+
+
+class ReceiptSettings(BaseModel):
+    # jwt (RS256, legacy) | ed25519 | hmac
+    mode: str = os.getenv("RECEIPT_SIGNING", "jwt").lower()
+    ed25519_key_path: Path = BASE_DIR / "certs" / "receipt-ed25519.pem"
+    hmac_secret: str | None = os.getenv("RECEIPT_HMAC_SECRET")
+    cache_size: int = 4096
 
 
 class Settings(BaseSettings):
     api_v1_prefix: str = "/api/v1"
-    jwt: AuthJWT = AuthJWT()
-    db: DbSettings = DbSettings()
+    permission_cache_ttl: float = 300.0  # seconds
+    jwt: AuthJWT = Field(default_factory=AuthJWT)
+    db: DbSettings = Field(default_factory=DbSettings)
+    monobank: MonobankSettings = Field(default_factory=MonobankSettings)
+    poller: PollerSettings = Field(default_factory=PollerSettings)
+    password: PasswordSettings = Field(default_factory=PasswordSettings)
+    receipt: ReceiptSettings = Field(default_factory=ReceiptSettings)
 
 
 settings = Settings()
@@ -1,57 +1,134 @@
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable
+
+from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import (
     create_async_engine,
     async_sessionmaker,
-    async_scoped_session,
+    AsyncEngine,
     AsyncSession,
 )
-from asyncio import current_task
+from sqlalchemy.dialects import postgresql, sqlite
 from core.config import settings
 
 
+def on_commit(session: AsyncSession, callback: Callable[[], None]):
+    """
+    Виконати callback (оновлення кешів, індексів) лише після успішного коміту
+    unit of work, до якого належить сесія.
+    """
+    session.info.setdefault("on_commit", []).append(callback)
+
+
+def dialect_insert(session: AsyncSession, model):
+    """
+    INSERT для діалекту поточної сесії (підтримує ON CONFLICT DO NOTHING)
+    """
+    if session.bind.dialect.name == "postgresql":
+        return postgresql.insert(model)
+    return sqlite.insert(model)
+
+
 class DatabaseHelper:
-    def __init__(self, url: str, echo: bool = False):
-        self.engine = create_async_engine(
-            url=url,
-            echo=echo,
-            pool_pre_ping=True,  # Check connections before reuse
-            pool_recycle=3600    # Recycle connections hourly
-        )
-        self.session_factory = async_sessionmaker(
-            bind=self.engine,
-            autoflush=False,
-            autocommit=False,
-            expire_on_commit=False,
-        )
-
-    def get_scoped_session(self):
-        return async_scoped_session(
-            session_factory=self.session_factory,
-            scopefunc=current_task
-        )
+    """
+    Engine і фабрика сесій створюються при першому зверненні, тому імпорт `core`
+    (Alembic, воркери, утиліти) не завантажує драйвер БД і не створює пул.
+    """
 
-    @staticmethod
-    async def session_dependency() -> AsyncSession:
+    def __init__(
+        self,
+        url: str,
+        echo: bool = False,
+        pool_size: int = 5,
+        max_overflow: int = 10,
+        pool_timeout: float = 30,
+    ):
+        self.url = url
+        self.echo = echo
+        self.pool_size = pool_size
+        self.max_overflow = max_overflow
+        self.pool_timeout = pool_timeout
+        self._engine: AsyncEngine | None = None
+        self._session_factory: async_sessionmaker[AsyncSession] | None = None
+
+    @property
+    def engine(self) -> AsyncEngine:
+        if self._engine is None:
+            pool_options = {}
+            if self.url.startswith("postgresql"):
+                pool_options = dict(
+                    pool_size=self.pool_size,
+                    max_overflow=self.max_overflow,
+                    pool_timeout=self.pool_timeout,
+                )
+            self._engine = create_async_engine(
+                url=self.url,
+                echo=self.echo,
+                pool_pre_ping=True,  # Check connections before reuse
+                pool_recycle=3600,   # Recycle connections hourly
+                **pool_options,
+            )
+        return self._engine
+
+    @property
+    def session_factory(self) -> async_sessionmaker[AsyncSession]:
+        if self._session_factory is None:
+            self._session_factory = async_sessionmaker(
+                bind=self.engine,
+                autoflush=False,
+                autocommit=False,
+                expire_on_commit=False,
+            )
+        return self._session_factory
+
+    async def dispose(self):
+        """Закрити пул з'єднань (при зупинці застосунку)"""
+        if self._engine is not None:
+            await self._engine.dispose()
+            self._engine = None
+            self._session_factory = None
+
+    @asynccontextmanager
+    async def unit_of_work(self) -> AsyncIterator[AsyncSession]:
         """
-        yields a brand‐new session from the factory and closes it on exit
+        Сесія з одним комітом наприкінці: хелпери лише виконують flush, а зміни
+        фіксуються разом після успішного завершення блоку (або відкочуються при помилці).
+        HTTPException зі статусом < 400 (наприклад, 204 після видалення) вважається успіхом.
         """
-        # note: we refer to the *singleton* below, not `self`
-        async with db_helper.session_factory() as session:
-            yield session
+        async with self.session_factory() as session:
+            try:
+                yield session
+            except HTTPException as exc:
+                if exc.status_code >= 400:
+                    await session.rollback()
+                    raise
+                await self._commit(session)
+                raise
+            except BaseException:
+                await session.rollback()
+                raise
+            else:
+                await self._commit(session)
 
     @staticmethod
-    async def scoped_session_dependency() -> AsyncSession:
+    async def _commit(session: AsyncSession):
+        await session.commit()
+        for callback in session.info.pop("on_commit", []):
+            callback()
+
+    @staticmethod
+    async def session_dependency() -> AsyncSession:
         """
-        yields the scoped_session (one‐per‐task) and then closes/removes it
+        yields a brand‐new session for the request and commits it once on exit
         """
-        session = db_helper.get_scoped_session()
-        try:
+        # note: we refer to the *singleton* below, not `self`
+        async with db_helper.unit_of_work() as session:
             yield session
-        finally:
-            await session.close()
-            await session.remove()
-
 
 db_helper = DatabaseHelper(
     url=settings.db.url,
     echo=settings.db.echo,
+    pool_size=settings.db.pool_size,
+    max_overflow=settings.db.max_overflow,
+    pool_timeout=settings.db.pool_timeout,
 )
\ No newline at end of file
@@ -0,0 +1,160 @@
+import asyncio
+import json
+import logging
+import uuid
+from typing import Awaitable, Callable
+
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+from core.db_helper import on_commit
+
+logger = logging.getLogger(__name__)
+
+EventHandler = Callable[[dict], None]
+
+# Події, які публікують модулі застосунку
+PAYMENT_INGESTED = "payment.ingested"
+ORDER_CREATED = "order.created"
+ORDER_PAID = "order.paid"
+ORDER_STATUS_CHANGED = "order.status_changed"
+ORDER_DELETED = "order.deleted"
+PERMISSION_CHANGED = "permission.changed"
+
+
+class EventBus:
+    """
+    Шина подій у межах процесу (SQLite, один воркер, тести).
+
+    Подія публікується в межах unit of work і доставляється обробникам лише після
+    успішного коміту; відкат транзакції скасовує і подію. Обробники синхронні
+    та мають бути ідемпотентними — помилка одного не заважає іншим.
+    """
+
+    def __init__(self):
+        self._handlers: dict[str, list[EventHandler]] = {}
+        self._resync_hooks: list[Callable[[], Awaitable[None]]] = []
+
+    def subscribe(self, event_type: str, handler: EventHandler):
+        self._handlers.setdefault(event_type, []).append(handler)
+
+    def on_resync(self, hook: Callable[[], Awaitable[None]]):
+        """
+        Повне оновлення локального стану, коли події могли бути пропущені
+        (перепідключення слухача PostgreSQL)
+        """
+        self._resync_hooks.append(hook)
+
+    async def publish(self, session: AsyncSession, event_type: str, payload: dict):
+        on_commit(session, lambda: self.dispatch(event_type, payload))
+
+    def dispatch(self, event_type: str, payload: dict):
+        for handler in self._handlers.get(event_type, ()):
+            try:
+                handler(payload)
+            except Exception:
+                logger.exception("Event handler for %s failed", event_type)
+
+    async def resync(self):
+        for hook in self._resync_hooks:
+            try:
+                await hook()
+            except Exception:
+                logger.exception("Event bus resync failed")
+
+    async def start(self):
+        pass
+
+    async def stop(self):
+        pass
+
+
+class PostgresEventBus(EventBus):
+    """
+    Шина подій між воркерами через PostgreSQL LISTEN/NOTIFY.
+
+    Воркер-публікатор обробляє подію локально після коміту, як і EventBus, а
+    pg_notify виконується в тій самій транзакції: PostgreSQL розсилає повідомлення
+    лише після коміту. Решта воркерів отримують його через окреме з'єднання
+    з LISTEN; власні повідомлення відкидаються за `origin`.
+    """
+
+    channel = "jar_events"
+
+    def __init__(self, url: str, reconnect_delay: float = 1.0):
+        super().__init__()
+        # psycopg приймає звичайний postgresql:// без драйвера SQLAlchemy
+        self.conninfo = (
+            make_url(url).set(drivername="postgresql").render_as_string(hide_password=False)
+        )
+        self.reconnect_delay = reconnect_delay
+        self.origin = uuid.uuid4().hex
+        self._task: asyncio.Task | None = None
+
+    async def publish(self, session: AsyncSession, event_type: str, payload: dict):
+        await super().publish(session, event_type, payload)
+        message = json.dumps(
+            {"origin": self.origin, "type": event_type, "payload": payload},
+            separators=(",", ":"),
+        )
+        await session.execute(
+            text("SELECT pg_notify(:channel, :message)"),
+            {"channel": self.channel, "message": message},
+        )
+
+    async def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._listen(), name="event-bus-listener")
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _listen(self):
+        import psycopg
+
+        connected_before = False
+        while True:
+            try:
+                async with await psycopg.AsyncConnection.connect(
+                    self.conninfo, autocommit=True
+                ) as connection:
+                    await connection.execute(f"LISTEN {self.channel}")
+                    if connected_before:
+                        # поки з'єднання не було, повідомлення могли загубитися
+                        await self.resync()
+                    connected_before = True
+                    async for notify in connection.notifies():
+                        self._receive(notify.payload)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Event bus listener disconnected")
+            await asyncio.sleep(self.reconnect_delay)
+
+    def _receive(self, raw: str):
+        try:
+            message = json.loads(raw)
+        except ValueError:
+            logger.warning("Malformed event bus message: %.200s", raw)
+            return
+        if message.get("origin") == self.origin:
+            return
+        self.dispatch(message["type"], message["payload"])
+
+
+def create_event_bus(url: str) -> EventBus:
+    if url.startswith("postgresql"):
+        return PostgresEventBus(url)
+    return EventBus()
+
+
+event_bus = create_event_bus(settings.db.url)
@@ -0,0 +1,110 @@
+import csv
+import io
+import json
+import zlib
+from typing import AsyncIterator, Callable, Literal
+
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select
+from sqlalchemy.engine import Row
+
+from core.db_helper import db_helper
+
+ExportFormat = Literal["ndjson", "csv"]
+
+# Скільки рядків серверний курсор віддає за раз і скільки потрапляє в один шматок відповіді
+EXPORT_BATCH_SIZE = 5000
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+async def iter_batches(
+    stmt: Select, batch_size: int = EXPORT_BATCH_SIZE
+) -> AsyncIterator[list[Row]]:
+    """
+    Рядки запиту пачками через серверний курсор (yield_per): у пам'яті одночасно
+    лише одна пачка, незалежно від розміру вивантаження.
+    """
+    async with db_helper.session_factory() as session:
+        result = await session.stream(stmt.execution_options(yield_per=batch_size))
+        async for batch in result.partitions():
+            yield batch
+
+
+def _encode_ndjson(rows: list[dict], header: bool) -> bytes:
+    return "".join(
+        json.dumps(row, default=str, separators=(",", ":")) + "\n" for row in rows
+    ).encode()
+
+
+# Табличні редактори виконують клітинку, що починається з цих символів, як формулу
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def csv_safe(value):
+    """
+    Захист від CSV-ін'єкції формул: коментарі донатерів потрапляють у файл як є,
+    тому такі рядки екрануються апострофом
+    """
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def _csv_encoder(columns: list[str]) -> Callable[[list[dict], bool], bytes]:
+    def encode(rows: list[dict], header: bool) -> bytes:
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=columns, extrasaction="ignore")
+        if header:
+            writer.writeheader()
+        writer.writerows(
+            {key: csv_safe(value) for key, value in row.items()} for row in rows
+        )
+        return buffer.getvalue().encode()
+
+    return encode
+
+
+def stream_export(
+    stmt: Select,
+    filename: str,
+    export_format: ExportFormat = "ndjson",
+    gzip: bool = False,
+    serialize: Callable[[Row], dict] = lambda row: row._asdict(),
+) -> StreamingResponse:
+    """
+    Потокове вивантаження результату запиту у NDJSON або CSV, за потреби стиснуте gzip.
+    Кожна пачка з курсора кодується й надсилається одразу.
+    """
+    if export_format == "csv":
+        encode = _csv_encoder([column.name for column in stmt.selected_columns])
+    else:
+        encode = _encode_ndjson
+
+    async def generate() -> AsyncIterator[bytes]:
+        # wbits=31 — формат gzip, а не сирий deflate
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if gzip else None
+        header = True
+        async for batch in iter_batches(stmt):
+            chunk = encode([serialize(row) for row in batch], header)
+            header = False
+            if compressor is not None:
+                chunk = compressor.compress(chunk)
+            if chunk:
+                yield chunk
+        if header and export_format == "csv":
+            # порожнє вивантаження — лише заголовок
+            chunk = encode([], True)
+            yield compressor.compress(chunk) if compressor is not None else chunk
+        if compressor is not None:
+            yield compressor.flush()
+
+    filename = f"{filename}.{export_format}" + (".gz" if gzip else "")
+    return StreamingResponse(
+        generate(),
+        media_type="application/gzip" if gzip else MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
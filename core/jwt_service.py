@@ -0,0 +1,130 @@
+import hashlib
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from datetime import timedelta, datetime, timezone
+from pathlib import Path
+
+import jwt
+from cryptography.hazmat.primitives.serialization import (
+    load_pem_private_key,
+    load_pem_public_key,
+)
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class JWTService:
+    """
+    Підпис і перевірка JWT з ключами, розібраними один раз у об'єкти `cryptography`.
+
+    Перевірені токени кешуються (LRU, до `exp`): повторний запит з тим самим
+    bearer-токеном не виконує RSA-перевірку підпису. Ключ кешу — хеш усього токена,
+    а не лише `jti`, тож підроблений токен з чужим `jti` кеш не пройде.
+    """
+
+    def __init__(
+        self,
+        private_key_path: Path,
+        public_key_path: Path,
+        algorithm: str,
+        cache_size: int = 1024,
+    ):
+        self.private_key_path = private_key_path
+        self.public_key_path = public_key_path
+        self.algorithm = algorithm
+        self.cache_size = cache_size
+        self._private_key = None
+        self._public_key = None
+        self._verified: OrderedDict[bytes, tuple[float, dict]] = OrderedDict()
+
+    @property
+    def private_key(self):
+        if self._private_key is None:
+            self._private_key = load_pem_private_key(
+                self.private_key_path.read_bytes(), password=None
+            )
+        return self._private_key
+
+    @property
+    def public_key(self):
+        if self._public_key is None:
+            self._public_key = load_pem_public_key(self.public_key_path.read_bytes())
+        return self._public_key
+
+    def preload(self) -> bool:
+        """
+        Завантажити ключі при старті застосунку. Відсутній ключ не зупиняє сервіс:
+        падатимуть лише ендпоінти, яким потрібен JWT.
+        """
+        try:
+            self.private_key
+            self.public_key
+        except (OSError, ValueError) as err:
+            logger.warning("JWT keys are not loaded: %s", err)
+            return False
+        return True
+
+    def encode(
+        self,
+        payload: dict,
+        expire_minutes: int = settings.jwt.access_token_expire_minutes,
+        expire_timedelta: timedelta | None = None,
+        private_key=None,
+        algorithm: str | None = None,
+    ) -> str:
+        to_encode = payload.copy()
+        now = datetime.now(timezone.utc)
+        if expire_timedelta:
+            expire = now + expire_timedelta
+        else:
+            expire = now + timedelta(minutes=expire_minutes)
+
+        to_encode.update(
+            exp=expire,
+            iat=now,
+            jti=str(uuid.uuid4()),
+        )
+        return jwt.encode(
+            to_encode,
+            self.private_key if private_key is None else private_key,
+            algorithm=algorithm or self.algorithm,
+        )
+
+    def decode(
+        self, token: str, public_key=None, algorithms: list[str] | None = None
+    ) -> dict:
+        if public_key is not None or algorithms is not None:
+            # Нестандартні ключ чи алгоритми — без кешу
+            return jwt.decode(
+                token,
+                self.public_key if public_key is None else public_key,
+                algorithms=algorithms or [self.algorithm],
+            )
+
+        cache_key = hashlib.sha256(token.encode()).digest()
+        cached = self._verified.get(cache_key)
+        if cached is not None:
+            expires_at, payload = cached
+            if expires_at > time.time():
+                self._verified.move_to_end(cache_key)
+                return dict(payload)
+            del self._verified[cache_key]
+
+        payload = jwt.decode(token, self.public_key, algorithms=[self.algorithm])
+        if "exp" in payload:
+            self._verified[cache_key] = (payload["exp"], payload)
+            if len(self._verified) > self.cache_size:
+                self._verified.popitem(last=False)
+        return dict(payload)
+
+
+jwt_service = JWTService(
+    private_key_path=settings.jwt.private_jwt_path,
+    public_key_path=settings.jwt.public_jwt_path,
+    algorithm=settings.jwt.algorithm,
+    cache_size=settings.jwt.verified_cache_size,
+)
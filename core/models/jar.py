@@ -0,0 +1,34 @@
+from sqlalchemy import String, BigInteger
+from sqlalchemy.orm import Mapped, mapped_column
+
+from core.base import Base
+from core.token_cipher import EncryptedToken
+
+
+class Jar(Base):
+    """Банка, зареєстрована для фонового опитування виписки"""
+
+    jar_id: Mapped[str] = mapped_column(String(100), nullable=False, unique=True)
+    # зашифрований ключем MONOBANK_TOKEN_KEY, у моделі — відкритий текст
+    monobank_token: Mapped[str] = mapped_column(EncryptedToken, nullable=False)
+    polled_at: Mapped[float] = mapped_column(nullable=True)
+
+
+class JarSyncState(Base):
+    """Курсор синхронізації: час останньої внесеної в реєстр транзакції банки"""
+
+    jar_id: Mapped[str] = mapped_column(String(100), nullable=False, unique=True)
+    last_seen_time: Mapped[int] = mapped_column(BigInteger, nullable=True)
+    synced_at: Mapped[float] = mapped_column(nullable=True)
+
+
+class BackfillJob(Base):
+    """Прогрес довантаження історичної виписки банки"""
+
+    jar_id: Mapped[str] = mapped_column(String(100), nullable=False)
+    from_time: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    to_time: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    # усе до цього часу вже внесено в реєстр
+    completed_until: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    finished: Mapped[bool] = mapped_column(nullable=False, default=False)
+    updated_at: Mapped[float] = mapped_column(nullable=True)
@@ -1,6 +1,6 @@
 from enum import Enum
 
-from sqlalchemy import String, Enum as SQLEnum
+from sqlalchemy import String, Enum as SQLEnum, Index
 from sqlalchemy.orm import Mapped, mapped_column
 
 from core.base import Base
@@ -16,6 +16,12 @@ class OrderStatus(str, Enum):
 
 
 class Order(Base):
+    __table_args__ = (
+        # Курсорна пагінація /order/list по (timestamp, id)
+        Index("ix_orders_jar_id_timestamp_id", "jar_id", "timestamp", "id"),
+        Index("ix_orders_status_timestamp_id", "status", "timestamp", "id"),
+    )
+
     jar_id: Mapped[str] = mapped_column(String(100), nullable=False)
     amount: Mapped[int] = mapped_column(nullable=False)
     timestamp: Mapped[float] = mapped_column(nullable=False)
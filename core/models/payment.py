@@ -1,13 +1,29 @@
 from core.base import Base
-from sqlalchemy import String, Integer, ForeignKey
+from sqlalchemy import BigInteger, String, Integer, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column
 
 
 class Payment(Base):
+    __table_args__ = (
+        # Пошук платежу для підтвердження замовлення (search_payment)
+        Index(
+            "ix_payments_jar_id_amount_comment",
+            "jar_id",
+            "amount",
+            "comment",
+            postgresql_include=["id", "order_id", "time"],
+        ),
+        # Курсорна пагінація /payment/list по (time, id)
+        Index("ix_payments_jar_id_time_id", "jar_id", "time", "id"),
+        Index("ix_payments_time_id", "time", "id"),
+    )
+
     jar_id: Mapped[str] = mapped_column(String(100), nullable=False)
     order_id: Mapped[int] = mapped_column(ForeignKey("orders.id"), nullable=True)
-    monobank_transaction_id: Mapped[str] = mapped_column(String, nullable=False)
+    monobank_transaction_id: Mapped[str] = mapped_column(
+        String, nullable=False, unique=True, index=True
+    )
     amount: Mapped[int] = mapped_column(Integer, nullable=False)
     description: Mapped[str] = mapped_column(String, nullable=True)
     comment: Mapped[str] = mapped_column(String, nullable=True)
-    time: Mapped[int] = mapped_column(String, nullable=True)
+    time: Mapped[int] = mapped_column(BigInteger, nullable=True)  # Unix-час, секунди
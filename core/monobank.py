@@ -0,0 +1,160 @@
+import asyncio
+import hashlib
+import time
+
+import httpx
+
+from core.config import settings
+
+
+def token_hash(token: str) -> str:
+    """Ключ для внутрішніх структур, щоб не тримати токен у відкритому вигляді"""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+class TokenRateLimiter:
+    """
+    Облік ліміту Monobank: не більше одного запиту на `interval` секунд для токена.
+    Стан живе в пам'яті процесу: запити інших воркерів він не бачить.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._next_allowed: dict[str, float] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+
+    def available_in(self, token: str) -> float:
+        """Скільки секунд лишилося до наступного дозволеного запиту"""
+        next_allowed = self._next_allowed.get(token_hash(token), 0.0)
+        return max(0.0, next_allowed - time.monotonic())
+
+    def ready(self, token: str) -> bool:
+        return self.available_in(token) == 0.0
+
+    def mark(self, token: str):
+        """Зафіксувати виконаний запит"""
+        self._next_allowed[token_hash(token)] = time.monotonic() + self.interval
+
+    async def wait(self, token: str):
+        """Дочекатися дозволеного вікна та зарезервувати його"""
+        lock = self._locks.setdefault(token_hash(token), asyncio.Lock())
+        async with lock:
+            delay = self.available_in(token)
+            if delay:
+                await asyncio.sleep(delay)
+            self.mark(token)
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class MonobankClient:
+    """
+    Асинхронний клієнт Monobank API зі спільним пулом з'єднань (keep-alive, HTTP/2).
+    Створюється один раз на процес і закривається в lifespan застосунку.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        timeout: float,
+        connect_timeout: float,
+        max_connections: int,
+        max_keepalive_connections: int,
+        keepalive_expiry: float,
+        http2: bool = True,
+        statement_interval: float = 60.0,
+    ):
+        self.base_url = base_url
+        self.timeout = httpx.Timeout(timeout, connect=connect_timeout)
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.http2 = http2 and _http2_available()
+        self._client: httpx.AsyncClient | None = None
+        # Спільний облік ліміту виписок для ручних запитів та фонового опитування
+        self.statement_limiter = TokenRateLimiter(statement_interval)
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        # клієнт створюється ліниво, щоб імпорт модуля не відкривав з'єднань
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=self.timeout,
+                limits=self.limits,
+                http2=self.http2,
+            )
+        return self._client
+
+    async def get(
+        self, path: str, token: str, timeout: float | None = None
+    ) -> httpx.Response:
+        """
+        GET-запит до Monobank з токеном у заголовку X-Token.
+        Скасування корутини (asyncio.CancelledError) перериває запит і повертає з'єднання в пул.
+        """
+        response = await self.client.get(
+            path,
+            headers={"X-Token": token},
+            timeout=self.timeout if timeout is None else timeout,
+        )
+        response.raise_for_status()
+        return response
+
+    async def post(self, path: str, token: str, json: dict) -> httpx.Response:
+        response = await self.client.post(path, headers={"X-Token": token}, json=json)
+        response.raise_for_status()
+        return response
+
+    async def client_info(self, token: str) -> dict:
+        response = await self.get("/personal/client-info", token=token)
+        return response.json()
+
+    async def statement(
+        self, token: str, account: str, from_time: int, to_time: int
+    ) -> list[dict]:
+        """
+        Виписка рахунку. Запит чекає на вільне вікно ліміту токена в межах процесу, тож
+        ручне оновлення одразу після фонового опитування в тому ж воркері не отримує 429.
+        Запит іншого воркера може вичерпати ліміт — тоді 429 від Monobank теж
+        резервує вікно, а помилка передається викликачу.
+        """
+        await self.statement_limiter.wait(token)
+        try:
+            response = await self.get(
+                f"/personal/statement/{account}/{from_time}/{to_time}", token=token
+            )
+        except httpx.HTTPStatusError as err:
+            if err.response.status_code == 429:
+                self.statement_limiter.mark(token)
+            raise
+        return response.json()
+
+    async def set_webhook(self, token: str, url: str):
+        """Зареєструвати URL, на який Monobank надсилатиме нові транзакції"""
+        await self.post("/personal/webhook", token=token, json={"webHookUrl": url})
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+monobank_client = MonobankClient(
+    base_url=settings.monobank.api_url,
+    timeout=settings.monobank.timeout,
+    connect_timeout=settings.monobank.connect_timeout,
+    max_connections=settings.monobank.max_connections,
+    max_keepalive_connections=settings.monobank.max_keepalive_connections,
+    keepalive_expiry=settings.monobank.keepalive_expiry,
+    http2=settings.monobank.http2,
+    statement_interval=settings.monobank.statement_interval,
+)
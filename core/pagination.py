@@ -0,0 +1,84 @@
+import base64
+import json
+from typing import Any, AsyncIterator, Callable
+
+from fastapi import HTTPException, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select, tuple_
+from sqlalchemy.engine import Row
+
+from core.db_helper import db_helper
+
+MAX_PAGE_SIZE = 500
+
+
+def encode_cursor(position: Any, row_id: int) -> str:
+    """Непрозорий курсор на позицію (ключ сортування, id) останнього рядка сторінки"""
+    raw = json.dumps([position, row_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[Any, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        position, row_id = json.loads(raw)
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        )
+    if not isinstance(row_id, int):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        )
+    return position, row_id
+
+
+def keyset_page(stmt: Select, position_column, id_column, cursor: str | None) -> Select:
+    """
+    Сторінка від найновіших записів. Наступна сторінка починається строго після
+    (position, id) з курсора, тому глибока сторінка читає індекс так само, як перша,
+    без OFFSET.
+    """
+    if cursor is not None:
+        position, row_id = decode_cursor(cursor)
+        stmt = stmt.where(tuple_(position_column, id_column) < (position, row_id))
+    return stmt.order_by(position_column.desc(), id_column.desc())
+
+
+def stream_page(
+    stmt: Select,
+    limit: int,
+    position_key: str,
+    serialize: Callable[[Row], dict] = lambda row: row._asdict(),
+) -> StreamingResponse:
+    """
+    Віддати сторінку як {"items": [...], "next_cursor": ...}, надсилаючи рядки
+    клієнту по мірі читання з бази. Сесія відкривається всередині генератора:
+    сесія запиту закривається до того, як StreamingResponse почне відповідь.
+    """
+
+    async def generate() -> AsyncIterator[bytes]:
+        async with db_helper.session_factory() as session:
+            result = await session.stream(stmt.limit(limit + 1))
+            yield b'{"items":['
+            last = None
+            count = 0
+            async for row in result:
+                if count == limit:
+                    break
+                if count:
+                    yield b","
+                yield json.dumps(serialize(row), default=str).encode()
+                last = row
+                count += 1
+            else:
+                # рядків не більше за limit — наступної сторінки немає
+                last = None
+            await result.close()
+
+        next_cursor = None
+        if last is not None:
+            next_cursor = encode_cursor(getattr(last, position_key), last.id)
+        yield b'],"next_cursor":' + json.dumps(next_cursor).encode() + b"}"
+
+    return StreamingResponse(generate(), media_type="application/json")
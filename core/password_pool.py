@@ -0,0 +1,61 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import bcrypt
+from fastapi import HTTPException, status
+
+from core.config import settings
+
+
+class PasswordHasher:
+    """
+    bcrypt в окремому обмеженому пулі потоків, щоб хешування не блокувало event loop.
+    Якщо в черзі вже `max_pending` операцій, нові логіни відхиляються з 503.
+    """
+
+    def __init__(self, max_workers: int, max_pending: int, rounds: int):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.rounds = rounds
+        self._pending = 0
+        self._executor: ThreadPoolExecutor | None = None
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="bcrypt"
+            )
+        return self._executor
+
+    async def _run(self, func, *args):
+        if self._pending >= self.max_pending:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many login attempts, try again later",
+                headers={"Retry-After": "1"},
+            )
+        self._pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, func, *args)
+        finally:
+            self._pending -= 1
+
+    async def hash(self, password: bytes) -> bytes:
+        return await self._run(bcrypt.hashpw, password, bcrypt.gensalt(self.rounds))
+
+    async def check(self, password: bytes, hashed_password: bytes) -> bool:
+        return await self._run(bcrypt.checkpw, password, hashed_password)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(
+    max_workers=settings.password.max_workers,
+    max_pending=settings.password.max_pending,
+    rounds=settings.password.bcrypt_rounds,
+)
@@ -0,0 +1,78 @@
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable
+
+import httpx
+
+from core.config import settings
+from core.single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+
+class ReadThroughCache:
+    """
+    Кеш відповідей зовнішнього API з обмеженням частоти запитів.
+
+    - значення свіже `ttl` секунд і віддається без звернення до API;
+    - одночасні промахи з одним ключем чекають на один спільний запит;
+    - якщо оновлення впало з помилкою з `stale_on`, віддається останнє відоме
+      значення, не старше `stale_ttl` секунд.
+
+    Ключ — хеш токена (token_hash), сирий токен у кеші не зберігається.
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        stale_ttl: float,
+        max_entries: int = 1024,
+        stale_on: tuple[type[BaseException], ...] = (Exception,),
+    ):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self.stale_on = stale_on
+        # ключ -> (monotonic-час отримання, значення)
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._flight = SingleFlight()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        entry = self._entries.get(key)
+        if entry is not None and time.monotonic() - entry[0] < self.ttl:
+            self._entries.move_to_end(key)
+            return entry[1]
+
+        return await self._flight.do(key, lambda: self._refresh(key, fetch))
+
+    async def _refresh(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        try:
+            value = await fetch()
+        except self.stale_on as err:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] < self.stale_ttl:
+                logger.warning("Serving stale value after refresh error: %s", err)
+                return entry[1]
+            raise
+        self._entries[key] = (time.monotonic(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return value
+
+    def invalidate(self, key: str | None = None):
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+
+client_info_cache = ReadThroughCache(
+    ttl=settings.monobank.client_info_ttl,
+    stale_ttl=settings.monobank.client_info_stale_seconds,
+    stale_on=(httpx.HTTPError,),
+)
@@ -0,0 +1,149 @@
+import base64
+import hashlib
+import hmac
+import json
+import logging
+from collections import OrderedDict
+from pathlib import Path
+
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+from cryptography.hazmat.primitives.serialization import (
+    Encoding,
+    PublicFormat,
+    load_pem_private_key,
+)
+
+from core.config import settings
+from core.jwt_service import jwt_service
+
+logger = logging.getLogger(__name__)
+
+
+def _reject_floats(value):
+    if isinstance(value, float):
+        raise TypeError(
+            "Signed data must not contain floats; use integers or strings"
+        )
+    if isinstance(value, dict):
+        for item in value.values():
+            _reject_floats(item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            _reject_floats(item)
+
+
+def canonical_encoding(data: dict) -> bytes:
+    """
+    Канонічне JSON-представлення: відсортовані ключі, без пробілів, UTF-8.
+    Числа з рухомою комою не допускаються: JSON-серіалізатори інших мов записують
+    їх по-різному (1.0 / 1), і перевірка підпису стороннім сервісом не збігалася б.
+    """
+    _reject_floats(data)
+    return json.dumps(
+        data, sort_keys=True, separators=(",", ":"), ensure_ascii=False
+    ).encode("utf-8")
+
+
+def _b64url(value: bytes) -> str:
+    return base64.urlsafe_b64encode(value).rstrip(b"=").decode("ascii")
+
+
+class ReceiptSigner:
+    """
+    Підпис результатів пошуку платежу (квитанцій).
+
+    Режими:
+    - jwt — RS256 JWT з усіма даними (попередня поведінка);
+    - ed25519 — відкріплений підпис Ed25519 над canonical_encoding(data);
+    - hmac — відкріплений HMAC-SHA256 над canonical_encoding(data).
+
+    Підписи ed25519/hmac детерміновані, тому кешуються за канонічним вмістом:
+    повторні запити щодо вже зіставлених (незмінних) платежів не підписуються знову.
+    """
+
+    def __init__(
+        self,
+        mode: str,
+        ed25519_key_path: Path,
+        hmac_secret: str | None,
+        cache_size: int,
+    ):
+        if mode not in ("jwt", "ed25519", "hmac"):
+            raise ValueError(f"Unknown receipt signing mode: {mode}")
+        self.mode = mode
+        self.ed25519_key_path = ed25519_key_path
+        self.hmac_secret = hmac_secret
+        self.cache_size = cache_size
+        self._ed25519_key: Ed25519PrivateKey | None = None
+        self._cache: OrderedDict[bytes, str] = OrderedDict()
+
+    @property
+    def algorithm(self) -> str:
+        return {"jwt": "RS256", "ed25519": "Ed25519", "hmac": "HS256"}[self.mode]
+
+    @property
+    def ed25519_key(self) -> Ed25519PrivateKey:
+        if self._ed25519_key is None:
+            key = load_pem_private_key(self.ed25519_key_path.read_bytes(), password=None)
+            if not isinstance(key, Ed25519PrivateKey):
+                raise ValueError("Receipt signing key must be an Ed25519 private key")
+            self._ed25519_key = key
+        return self._ed25519_key
+
+    def preload(self) -> bool:
+        """Завантажити ключ Ed25519 при старті; помилка лише логується"""
+        if self.mode != "ed25519":
+            return True
+        try:
+            self.ed25519_key
+        except (OSError, ValueError) as err:
+            logger.warning("Receipt signing key is not loaded: %s", err)
+            return False
+        return True
+
+    def _sign_detached(self, message: bytes) -> str:
+        if self.mode == "ed25519":
+            return _b64url(self.ed25519_key.sign(message))
+        if not self.hmac_secret:
+            raise ValueError("RECEIPT_HMAC_SECRET is not configured")
+        return _b64url(
+            hmac.new(self.hmac_secret.encode(), message, hashlib.sha256).digest()
+        )
+
+    def sign(self, data: dict) -> str:
+        if self.mode == "jwt":
+            return jwt_service.encode(data)
+
+        message = canonical_encoding(data)
+        signature = self._cache.get(message)
+        if signature is None:
+            signature = self._sign_detached(message)
+            self._cache[message] = signature
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        else:
+            self._cache.move_to_end(message)
+        return signature
+
+    def verification_key(self) -> dict:
+        """Дані для перевірки підпису стороннім сервісом"""
+        if self.mode == "ed25519":
+            public_key = self.ed25519_key.public_key().public_bytes(
+                Encoding.Raw, PublicFormat.Raw
+            )
+            return {"alg": self.algorithm, "public_key": _b64url(public_key)}
+        if self.mode == "jwt":
+            public_pem = jwt_service.public_key.public_bytes(
+                Encoding.PEM, PublicFormat.SubjectPublicKeyInfo
+            )
+            return {"alg": self.algorithm, "public_key": public_pem.decode()}
+        # HMAC — спільний секрет, який не публікується
+        return {"alg": self.algorithm, "public_key": None}
+
+
+receipt_signer = ReceiptSigner(
+    mode=settings.receipt.mode,
+    ed25519_key_path=settings.receipt.ed25519_key_path,
+    hmac_secret=settings.receipt.hmac_secret,
+    cache_size=settings.receipt.cache_size,
+)
@@ -0,0 +1,29 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Hashable
+
+
+class SingleFlight:
+    """
+    Об'єднання одночасних однакових операцій: поки операція з ключем виконується,
+    інші виклики з тим самим ключем чекають на неї й отримують той самий результат
+    (або ту саму помилку). Після завершення наступний виклик запускає її знову.
+    """
+
+    def __init__(self):
+        self._inflight: dict[Hashable, asyncio.Task] = {}
+
+    def __len__(self) -> int:
+        return len(self._inflight)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # скасування одного клієнта не скасовує спільну операцію для інших
+        return await asyncio.shield(task)
+
+
+# Запити виписки та інкрементальні оновлення банок: ключ (token_hash, jar_id, вікно)
+statement_flight = SingleFlight()
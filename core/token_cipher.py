@@ -0,0 +1,78 @@
+import logging
+from pathlib import Path
+
+from cryptography.fernet import Fernet, InvalidToken
+from sqlalchemy import String
+from sqlalchemy.types import TypeDecorator
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class TokenCipher:
+    """
+    Шифрування токенів Monobank у базі даних (Fernet: AES-128-CBC + HMAC-SHA256).
+    Ключ — MONOBANK_TOKEN_KEY або файл `certs/monobank-token.key`
+    (згенерувати: `python -c "from cryptography.fernet import Fernet; print(Fernet.generate_key().decode())"`).
+    """
+
+    def __init__(self, key: str | None, key_path: Path):
+        self.key = key
+        self.key_path = key_path
+        self._fernet: Fernet | None = None
+
+    @property
+    def fernet(self) -> Fernet:
+        if self._fernet is None:
+            key = self.key
+            if not key:
+                try:
+                    key = self.key_path.read_text().strip()
+                except OSError:
+                    raise RuntimeError(
+                        "Monobank token key is not configured: set MONOBANK_TOKEN_KEY "
+                        f"or create {self.key_path}"
+                    )
+            self._fernet = Fernet(key)
+        return self._fernet
+
+    def preload(self) -> bool:
+        """Перевірити ключ при старті; без ключа не працюють лише зареєстровані банки"""
+        try:
+            self.fernet
+        except (RuntimeError, ValueError) as err:
+            logger.warning("Monobank token key is not loaded: %s", err)
+            return False
+        return True
+
+    def encrypt(self, token: str) -> str:
+        return self.fernet.encrypt(token.encode()).decode("ascii")
+
+    def decrypt(self, value: str) -> str:
+        try:
+            return self.fernet.decrypt(value.encode("ascii")).decode()
+        except InvalidToken:
+            raise RuntimeError("Stored Monobank token cannot be decrypted with this key")
+
+
+token_cipher = TokenCipher(
+    key=settings.monobank.token_key, key_path=settings.monobank.token_key_path
+)
+
+
+class EncryptedToken(TypeDecorator):
+    """Колонка, що зберігає токен зашифрованим, а в моделі віддає відкритий текст"""
+
+    impl = String(512)
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return token_cipher.encrypt(value)
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return token_cipher.decrypt(value)
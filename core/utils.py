@@ -1,11 +1,10 @@
-import uuid
-from datetime import timedelta, datetime, timezone
+from datetime import timedelta
 
-import bcrypt
-import jwt
 from fastapi import HTTPException, status
 
 from core.config import settings, system_token
+from core.jwt_service import jwt_service
+from core.password_pool import password_hasher
 
 
 async def check_system_token_to_auth(token: str):
@@ -22,8 +21,7 @@ async def check_system_token_to_auth(token: str):
 
 
 async def hash_password(password: bytes) -> str:
-    salt = bcrypt.gensalt()
-    hashed = bcrypt.hashpw(password, salt)
+    hashed = await password_hasher.hash(password)
     # store as text, not bytes, to fit VARCHAR columns and avoid psycopg byte adaptation issues
     # зберігати як текст, а не як байти, щоб уникнути проблеми з postgresql
     return hashed.decode("utf-8")
@@ -31,29 +29,18 @@ async def hash_password(password: bytes) -> str:
 
 async def encode_jwt(
     payload: dict,
-    private_key: str = settings.jwt.private_jwt_path.read_text(),
+    private_key=None,
     algorithm: str = settings.jwt.algorithm,
     expire_minutes: int = settings.jwt.access_token_expire_minutes,
     expire_timedelta: timedelta | None = None,
 ) -> str:
-    to_encode = payload.copy()
-    now = datetime.now(timezone.utc)
-    if expire_timedelta:
-        expire = now + expire_timedelta
-    else:
-        expire = now + timedelta(minutes=expire_minutes)
-
-    to_encode.update(
-        exp=expire,
-        iat=now,
-        jti=str(uuid.uuid4()),
-    )
-    encoded = jwt.encode(
-        to_encode,
-        private_key,
+    return jwt_service.encode(
+        payload,
+        expire_minutes=expire_minutes,
+        expire_timedelta=expire_timedelta,
+        private_key=private_key,
         algorithm=algorithm,
     )
-    return encoded
 
 
 async def encode_refresh_jwt(
@@ -68,10 +55,7 @@ async def encode_refresh_jwt(
 
 async def decode_jwt(
     token: str,
-    public_key: str = settings.jwt.public_jwt_path.read_text(),
+    public_key=None,
     algorithms: list[str] | None = None,
 ) -> dict:
-    if algorithms is None:
-        algorithms = [settings.jwt.algorithm]
-    payload = jwt.decode(token, public_key, algorithms=algorithms)
-    return payload
+    return jwt_service.decode(token, public_key=public_key, algorithms=algorithms)
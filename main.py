@@ -1,12 +1,50 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
 
 from api_v1 import router
+from api_v1.events import register_event_handlers
+from api_v1.order.matcher import order_matcher
+from api_v1.payment.poller import jar_poller
+from core.config import settings
+from core.db_helper import db_helper
+from core.event_bus import event_bus
+from core.jwt_service import jwt_service
+from core.monobank import monobank_client
+from core.password_pool import password_hasher
+from core.receipt_signer import receipt_signer
+from core.token_cipher import token_cipher
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Ключі читаються тут, а не під час імпорту; відсутній ключ лише логується
+    jwt_service.preload()
+    receipt_signer.preload()
+    token_cipher.preload()
+    # Кеші, індекс і підписники оновлюються подіями з усіх воркерів
+    register_event_handlers()
+    await event_bus.start()
+    # Індекс відкритих замовлень для миттєвого зіставлення з транзакціями
+    async with db_helper.session_factory() as session:
+        await order_matcher.rebuild(session)
+    if settings.poller.enabled:
+        jar_poller.start()
+    yield
+    await jar_poller.stop()
+    await event_bus.stop()
+    # Закрити спільний пул з'єднань до Monobank
+    await monobank_client.close()
+    password_hasher.shutdown()
+    await db_helper.dispose()
+
 
 app = FastAPI(
     title="Backend for serve and managing Jars by Monobank",
     version="0.1",
+    lifespan=lifespan,
 )
 
 # Дозволити CORS для всього API
@@ -0,0 +1,79 @@
+"""
+Production-запуск: кілька воркерів uvicorn без reload.
+
+    python serve.py --workers 4 --host 0.0.0.0 --port 8000
+
+uvloop та httptools використовуються, якщо встановлені (uvicorn[standard]).
+Пул з'єднань кожного воркера розраховується так, щоб усі воркери разом тримали
+не більше DB_MAX_CONNECTIONS з'єднань до PostgreSQL.
+"""
+
+import argparse
+import os
+
+import uvicorn
+
+from core.config import settings
+
+
+# З'єднання воркера поза пулом: advisory lock опитувача та LISTEN шини подій
+RESERVED_PER_WORKER = 2
+
+
+def pool_per_worker(workers: int, max_connections: int, pool_size: int) -> tuple[int, int]:
+    """
+    Розділити бюджет з'єднань між воркерами, залишивши місце для з'єднань поза пулом.
+    :return: (pool_size, max_overflow) для одного воркера
+    :raises ValueError: бюджету не вистачає навіть на одне з'єднання пулу на воркер
+    """
+    if workers * (1 + RESERVED_PER_WORKER) > max_connections:
+        raise ValueError(
+            f"DB_MAX_CONNECTIONS={max_connections} is too low for {workers} workers: "
+            f"each needs at least {1 + RESERVED_PER_WORKER} connections, "
+            f"use at most {max_connections // (1 + RESERVED_PER_WORKER)} workers"
+        )
+    budget = max_connections // workers - RESERVED_PER_WORKER
+    size = max(1, min(pool_size, budget))
+    return size, budget - size
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Production server")
+    parser.add_argument("--host", default=os.getenv("HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", 8000)))
+    parser.add_argument(
+        "--workers", type=int, default=int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1))
+    )
+    args = parser.parse_args()
+
+    try:
+        pool_size, max_overflow = pool_per_worker(
+            workers=args.workers,
+            max_connections=settings.db.max_connections,
+            pool_size=settings.db.pool_size,
+        )
+    except ValueError as err:
+        parser.error(str(err))
+    # Воркери — окремі процеси, тому налаштування передаються через змінні середовища
+    os.environ["DB_POOL_SIZE"] = str(pool_size)
+    os.environ["DB_MAX_OVERFLOW"] = str(max_overflow)
+    print(
+        f"Starting {args.workers} workers, DB pool per worker: "
+        f"{pool_size} + {max_overflow} overflow "
+        f"(<= {settings.db.max_connections} connections total)"
+    )
+
+    uvicorn.run(
+        "main:app",
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        loop="auto",  # uvloop, якщо встановлений
+        http="auto",  # httptools, якщо встановлений
+        proxy_headers=True,
+        timeout_graceful_shutdown=30,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+import os
+import tempfile
+from pathlib import Path
+
+import pytest
+
+# core.config читає змінні середовища при імпорті, тому вони задаються до імпорту застосунку
+_tmp = tempfile.TemporaryDirectory()
+DB_PATH = Path(_tmp.name) / "test.db"
+OPERATION_TOKEN = "test-operation-token"
+WEBHOOK_SECRET = "test-webhook-secret"
+
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{DB_PATH}"
+os.environ["OPERATION_TOKEN"] = OPERATION_TOKEN
+os.environ["MONOBANK_WEBHOOK_SECRET"] = WEBHOOK_SECRET
+os.environ["JAR_POLLER_ENABLED"] = "0"
+
+
+@pytest.fixture(scope="session")
+def client():
+    from fastapi.testclient import TestClient
+    from sqlalchemy import create_engine
+
+    from core import Base
+    from main import app
+
+    engine = create_engine(f"sqlite:///{DB_PATH}")
+    Base.metadata.create_all(engine)
+    engine.dispose()
+
+    with TestClient(app) as test_client:
+        yield test_client
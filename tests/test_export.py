@@ -0,0 +1,104 @@
+"""
+Потокове вивантаження /payment/export: пачки курсора зменшено до 2 рядків,
+щоб вивантаження складалося з кількох шматків відповіді.
+"""
+
+import csv
+import gzip
+import io
+import json
+
+import pytest
+
+from core import export
+from core.config import operation_token
+from core.db_helper import db_helper
+from core.models.payment import Payment
+
+JAR_ID = "jar-export"
+HEADERS = {"X-Operation-Token": operation_token}
+COMMENTS = ["=SUM(A1:A9)", "+380", "-1", "@cmd", "Дякую!"]
+
+
+async def seed_payments():
+    async with db_helper.unit_of_work() as session:
+        session.add_all(
+            Payment(
+                jar_id=JAR_ID,
+                monobank_transaction_id=f"export-{index}",
+                amount=100 + index,
+                comment=comment,
+                time=1700000000 + index,
+            )
+            for index, comment in enumerate(COMMENTS)
+        )
+
+
+@pytest.fixture(scope="module")
+def seeded(client):
+    client.portal.call(seed_payments)
+
+
+@pytest.fixture
+def batches(monkeypatch):
+    """Кількість пачок (шматків відповіді), з яких складено вивантаження"""
+    sizes = []
+    iter_batches = export.iter_batches
+
+    async def small_batches(stmt, batch_size=2):
+        async for batch in iter_batches(stmt, batch_size=batch_size):
+            sizes.append(len(batch))
+            yield batch
+
+    monkeypatch.setattr(export, "iter_batches", small_batches)
+    return sizes
+
+
+def export_payments(client, **params) -> bytes:
+    response = client.get(
+        "/payment/export", params={"jar_id": JAR_ID, **params}, headers=HEADERS
+    )
+    assert response.status_code == 200
+    return response.content
+
+
+def test_csv_header_once_and_formulas_escaped(client, seeded, batches):
+    content = export_payments(client, format="csv").decode()
+
+    assert len(batches) > 1
+    lines = content.splitlines()
+    assert sum(line.startswith("id,") for line in lines) == 1
+    rows = list(csv.DictReader(io.StringIO(content)))
+    assert [row["comment"] for row in rows] == [
+        "'=SUM(A1:A9)",
+        "'+380",
+        "'-1",
+        "'@cmd",
+        "Дякую!",
+    ]
+
+
+def test_ndjson_keeps_comments_as_is(client, seeded, batches):
+    content = export_payments(client, format="ndjson").decode()
+
+    assert len(batches) > 1
+    rows = [json.loads(line) for line in content.splitlines()]
+    assert [row["comment"] for row in rows] == COMMENTS
+    assert rows[0]["time"] == 1700000000
+
+
+def test_gzip_export_matches_plain(client, seeded, batches):
+    plain = export_payments(client, format="csv")
+    compressed = export_payments(client, format="csv", gzip=True)
+    assert gzip.decompress(compressed) == plain
+
+
+def test_empty_csv_export_has_header_only(client, batches):
+    response = client.get(
+        "/payment/export",
+        params={"jar_id": "jar-export-empty", "format": "csv"},
+        headers=HEADERS,
+    )
+    assert response.text.splitlines() == [
+        "id,jar_id,order_id,monobank_transaction_id,amount,comment,time"
+    ]
@@ -0,0 +1,23 @@
+"""
+Бюджет часу холодного імпорту `main` (див. benchmarks/bench_import_time.py).
+Поріг можна змінити через IMPORT_TIME_BUDGET (секунди) для повільних CI-машин.
+"""
+
+import os
+
+from benchmarks.bench_import_time import measure
+
+BUDGET = float(os.getenv("IMPORT_TIME_BUDGET", 2.0))
+RUNS = 3
+
+
+def test_cold_import_of_main_within_budget():
+    # найкращий із кількох запусків, щоб не залежати від випадкового навантаження
+    results = [measure() for _ in range(RUNS)]
+    best = min(result["seconds"] for result in results)
+    assert best <= BUDGET, f"cold import of main took {best:.2f} s (budget {BUDGET} s)"
+
+
+def test_import_reads_no_key_files():
+    result = measure()
+    assert result["keys_opened"] == []
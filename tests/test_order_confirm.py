@@ -0,0 +1,57 @@
+import time
+
+from core.config import operation_token
+from core.db_helper import db_helper
+from core.models.payment import Payment
+
+HEADERS = {"X-Operation-Token": operation_token}
+
+
+async def add_payment(transaction_id: str, jar_id: str, amount: int, comment: str, at: int) -> int:
+    """Транзакція в реєстрі без автоматичного зіставлення із замовленнями"""
+    async with db_helper.unit_of_work() as session:
+        payment = Payment(
+            jar_id=jar_id,
+            monobank_transaction_id=transaction_id,
+            amount=amount,
+            comment=comment,
+            time=at,
+        )
+        session.add(payment)
+        await session.flush()
+        return payment.id
+
+
+def test_confirm_skips_payment_older_than_order(client):
+    now = int(time.time())
+    client.portal.call(add_payment, "confirm-old", "jar-confirm", 700, "confirm", now - 600)
+    order = client.post(
+        "/order/create",
+        params={"jar_id": "jar-confirm", "amount": 700, "comment": "confirm"},
+        headers=HEADERS,
+    ).json()
+    newer_id = client.portal.call(
+        add_payment, "confirm-new", "jar-confirm", 700, "confirm", now + 5
+    )
+
+    response = client.patch("/order/confirm", params={"order_id": order["id"]}, headers=HEADERS)
+    assert response.status_code == 200
+    assert response.json()["status"] == "paid"
+
+    results = client.post(
+        "/order/confirm/batch", json={"order_ids": [order["id"]]}, headers=HEADERS
+    ).json()
+    assert results[0]["payment_id"] == newer_id
+
+
+def test_confirm_without_newer_payment_is_not_found(client):
+    now = int(time.time())
+    client.portal.call(add_payment, "confirm-only-old", "jar-confirm", 800, "confirm", now - 600)
+    order = client.post(
+        "/order/create",
+        params={"jar_id": "jar-confirm", "amount": 800, "comment": "confirm"},
+        headers=HEADERS,
+    ).json()
+
+    response = client.patch("/order/confirm", params={"order_id": order["id"]}, headers=HEADERS)
+    assert response.status_code == 404
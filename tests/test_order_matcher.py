@@ -0,0 +1,130 @@
+"""
+Індекс відкритих замовлень (order_matcher): зіставлення нових транзакцій
+і оновлення індексу подіями після коміту.
+"""
+
+import itertools
+import time
+
+import pytest
+from sqlalchemy import update
+
+from api_v1.order.matcher import order_matcher
+from core.config import operation_token
+from core.db_helper import db_helper
+from core.models.order import Order, OrderStatus
+from core.models.payment import Payment
+
+HEADERS = {"X-Operation-Token": operation_token}
+_ids = itertools.count(1)
+
+
+def create_order(client, jar_id: str, amount: int = 500, comment: str = "match") -> int:
+    response = client.post(
+        "/order/create",
+        params={"jar_id": jar_id, "amount": amount, "comment": comment},
+        headers=HEADERS,
+    )
+    return response.json()["id"]
+
+
+async def ingest_payment(
+    jar_id: str, amount: int = 500, comment: str = "match", fail: bool = False
+) -> list[int]:
+    """Внести транзакцію та зіставити її; fail — відкотити unit of work наприкінці"""
+    async with db_helper.unit_of_work() as session:
+        payment = Payment(
+            jar_id=jar_id,
+            monobank_transaction_id=f"match-{next(_ids)}",
+            amount=amount,
+            comment=comment,
+            time=int(time.time()) + 1,
+        )
+        session.add(payment)
+        await session.flush()
+        paid_orders = await order_matcher.match_payments([payment], session)
+        if fail:
+            raise RuntimeError("rollback")
+        return [order.id for order in paid_orders]
+
+
+async def order_status(order_id: int) -> OrderStatus:
+    async with db_helper.session_factory() as session:
+        return (await session.get(Order, order_id)).status
+
+
+async def close_without_event(order_id: int):
+    """Закрити замовлення в обхід шини подій — індекс про це не дізнається"""
+    async with db_helper.session_factory() as session:
+        await session.execute(
+            update(Order).where(Order.id == order_id).values(status=OrderStatus.paid)
+        )
+        await session.commit()
+
+
+def find(jar_id: str, amount: int = 500, comment: str = "match"):
+    return order_matcher.find(jar_id, amount, comment, time.time() + 1)
+
+
+def test_identical_orders_are_paid_oldest_first(client):
+    first = create_order(client, "jar-match-oldest")
+    second = create_order(client, "jar-match-oldest")
+
+    assert client.portal.call(ingest_payment, "jar-match-oldest") == [first]
+    assert find("jar-match-oldest") == second
+    assert client.portal.call(ingest_payment, "jar-match-oldest") == [second]
+    assert client.portal.call(order_status, first) == OrderStatus.paid
+    assert client.portal.call(order_status, second) == OrderStatus.paid
+
+
+def test_stale_entry_does_not_consume_payment(client):
+    stale = create_order(client, "jar-match-stale")
+    open_order = create_order(client, "jar-match-stale")
+    client.portal.call(close_without_event, stale)
+    assert find("jar-match-stale") == stale
+
+    assert client.portal.call(ingest_payment, "jar-match-stale") == [open_order]
+    assert client.portal.call(order_status, open_order) == OrderStatus.paid
+
+
+def test_rollback_keeps_order_matchable(client):
+    order_id = create_order(client, "jar-match-rollback")
+
+    with pytest.raises(RuntimeError):
+        client.portal.call(ingest_payment, "jar-match-rollback", 500, "match", True)
+
+    assert find("jar-match-rollback") == order_id
+    assert client.portal.call(order_status, order_id) == OrderStatus.created
+    assert client.portal.call(ingest_payment, "jar-match-rollback") == [order_id]
+
+
+def test_paid_event_removes_order_from_index(client):
+    order_id = create_order(client, "jar-match-event")
+    size = len(order_matcher)
+
+    client.portal.call(ingest_payment, "jar-match-event")
+
+    assert find("jar-match-event") is None
+    assert len(order_matcher) == size - 1
+
+
+def test_index_is_updated_only_after_commit(client):
+    order_id = create_order(client, "jar-match-commit")
+
+    async def match_and_look():
+        async with db_helper.unit_of_work() as session:
+            payment = Payment(
+                jar_id="jar-match-commit",
+                monobank_transaction_id=f"match-{next(_ids)}",
+                amount=500,
+                comment="match",
+                time=int(time.time()) + 1,
+            )
+            session.add(payment)
+            await session.flush()
+            await order_matcher.match_payments([payment], session)
+            # до коміту замовлення лишається в індексі
+            return find("jar-match-commit")
+
+    assert client.portal.call(match_and_look) == order_id
+    assert find("jar-match-commit") is None
@@ -0,0 +1,36 @@
+from api_v1.system.permission_cache import PermissionCache
+from core.enums import AdminPermission
+
+PERMISSION = next(iter(AdminPermission))
+
+
+def test_set_caches_when_nothing_changed():
+    cache = PermissionCache(ttl=60)
+    generation = cache.generation(1)
+    cache.set(1, {PERMISSION}, generation=generation)
+    assert cache.get(1) == frozenset({PERMISSION})
+
+
+def test_set_skips_permissions_read_before_invalidation():
+    cache = PermissionCache(ttl=60)
+    generation = cache.generation(1)
+    # дозвіл відкликано, поки запит читав базу
+    cache.invalidate(1)
+    assert cache.set(1, {PERMISSION}, generation=generation) == frozenset({PERMISSION})
+    assert cache.get(1) is None
+
+
+def test_set_skips_after_full_invalidation():
+    cache = PermissionCache(ttl=60)
+    generation = cache.generation(1)
+    cache.invalidate()
+    cache.set(1, {PERMISSION}, generation=generation)
+    assert cache.get(1) is None
+
+
+def test_other_admin_changes_do_not_block_caching():
+    cache = PermissionCache(ttl=60)
+    generation = cache.generation(1)
+    cache.invalidate(2)
+    cache.set(1, {PERMISSION}, generation=generation)
+    assert cache.get(1) == frozenset({PERMISSION})
@@ -0,0 +1,36 @@
+import base64
+import hashlib
+import hmac
+
+import pytest
+
+from core.config import BASE_DIR
+from core.receipt_signer import ReceiptSigner, canonical_encoding
+
+RECEIPT = {"id": 7, "jar_id": "jar-a", "amount": 1500, "comment": "Слава", "time": 1700000000}
+
+
+def make_signer() -> ReceiptSigner:
+    return ReceiptSigner(
+        mode="hmac",
+        ed25519_key_path=BASE_DIR / "certs" / "missing.pem",
+        hmac_secret="secret",
+        cache_size=10,
+    )
+
+
+def test_canonical_encoding_is_documented_form():
+    assert canonical_encoding(RECEIPT) == (
+        '{"amount":1500,"comment":"Слава","id":7,"jar_id":"jar-a","time":1700000000}'
+    ).encode("utf-8")
+
+
+def test_canonical_encoding_rejects_floats():
+    with pytest.raises(TypeError):
+        canonical_encoding({**RECEIPT, "time": 1700000000.0})
+
+
+def test_hmac_signature_matches_independent_check():
+    digest = hmac.new(b"secret", canonical_encoding(RECEIPT), hashlib.sha256).digest()
+    expected = base64.urlsafe_b64encode(digest).rstrip(b"=").decode("ascii")
+    assert make_signer().sign(RECEIPT) == expected
@@ -0,0 +1,22 @@
+import pytest
+
+from serve import RESERVED_PER_WORKER, pool_per_worker
+
+
+def test_pool_fits_connection_budget():
+    pool_size, max_overflow = pool_per_worker(workers=4, max_connections=80, pool_size=5)
+    assert (pool_size, max_overflow) == (5, 13)
+    assert 4 * (pool_size + max_overflow + RESERVED_PER_WORKER) <= 80
+
+
+def test_smallest_budget_gives_one_connection_per_worker():
+    workers = 20
+    max_connections = workers * (1 + RESERVED_PER_WORKER)
+    assert pool_per_worker(workers, max_connections, pool_size=5) == (1, 0)
+
+
+def test_too_many_workers_for_budget():
+    workers = 20
+    max_connections = workers * (1 + RESERVED_PER_WORKER) - 1
+    with pytest.raises(ValueError):
+        pool_per_worker(workers, max_connections, pool_size=5)
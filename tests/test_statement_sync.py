@@ -0,0 +1,96 @@
+"""
+Інкрементальна синхронізація виписки: сторінки по 500 транзакцій і курсор банки.
+Monobank замінено заглушками monobank_client.statement / monobank_client.get.
+"""
+
+import time
+
+import httpx
+from sqlalchemy import func, select
+
+from api_v1.payment.crud import get_sync_state, refresh_jar_payments
+from api_v1.system.dependencies import STATEMENT_PAGE_LIMIT
+from core.config import operation_token
+from core.db_helper import db_helper
+from core.models.payment import Payment
+from core.monobank import monobank_client
+
+
+
+def transactions(count: int, newest: int, prefix: str) -> list[dict]:
+    """Сторінка виписки від найновіших, по секунді між транзакціями"""
+    return [
+        {"id": f"{prefix}-{index}", "time": newest - index, "amount": 100, "comment": None}
+        for index in range(count)
+    ]
+
+
+async def stored_state(jar_id: str):
+    async with db_helper.session_factory() as session:
+        count = await session.scalar(
+            select(func.count()).select_from(Payment).where(Payment.jar_id == jar_id)
+        )
+        sync_state = await get_sync_state(jar_id=jar_id, session=session)
+        return count, sync_state.last_seen_time
+
+
+def test_full_page_is_followed_by_older_page(client, monkeypatch):
+    newest = int(time.time()) - 60
+    full_page = transactions(STATEMENT_PAGE_LIMIT, newest, "full")
+    oldest_of_full = full_page[-1]["time"]
+    # сторінка до межі включно: перша транзакція повторюється
+    short_page = [full_page[-1]] + transactions(3, oldest_of_full - 1, "short")
+    pages = [full_page, short_page]
+    calls = []
+
+    async def fake_statement(token, account, from_time, to_time):
+        calls.append((from_time, to_time))
+        return pages[len(calls) - 1]
+
+    monkeypatch.setattr(monobank_client, "statement", fake_statement)
+
+    new_payments = client.portal.call(refresh_jar_payments, "token", "jar-sync-pages")
+
+    assert len(calls) == 2
+    assert calls[1] == (calls[0][0], oldest_of_full)
+    assert len(new_payments) == STATEMENT_PAGE_LIMIT + 3
+    assert client.portal.call(stored_state, "jar-sync-pages") == (
+        STATEMENT_PAGE_LIMIT + 3,
+        newest,
+    )
+
+
+def test_cursor_does_not_move_back(client, monkeypatch):
+    newest = int(time.time()) - 60
+    pages = [
+        transactions(2, newest, "cursor-new"),
+        # запізніла транзакція, старіша за курсор (вікно перекриття)
+        transactions(1, newest - 10, "cursor-late"),
+    ]
+
+    async def fake_statement(token, account, from_time, to_time):
+        return pages.pop(0)
+
+    monkeypatch.setattr(monobank_client, "statement", fake_statement)
+    client.portal.call(refresh_jar_payments, "token", "jar-sync-cursor")
+    client.portal.call(refresh_jar_payments, "token", "jar-sync-cursor")
+
+    assert client.portal.call(stored_state, "jar-sync-cursor") == (3, newest)
+
+
+def test_monobank_429_from_another_worker(client, monkeypatch):
+    async def rate_limited(path, token, timeout=None):
+        request = httpx.Request("GET", f"{monobank_client.base_url}{path}")
+        response = httpx.Response(429, request=request)
+        raise httpx.HTTPStatusError("Too many requests", request=request, response=response)
+
+    monkeypatch.setattr(monobank_client, "get", rate_limited)
+    response = client.post(
+        "/payment/update/existing_payments",
+        params={"jar_id": "jar-sync-limited"},
+        headers={"X-Operation-Token": operation_token, "monobank-token": "limited-token"},
+    )
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "60"
+    # наступний запит цього процесу чекатиме на вікно, а не піде одразу в Monobank
+    assert not monobank_client.statement_limiter.ready("limited-token")
@@ -0,0 +1,140 @@
+"""
+Прийом webhook Monobank: тести надсилають події так, як це робить Monobank
+(POST JSON на /payment/webhook?secret=...).
+"""
+
+import itertools
+import time
+
+from core.config import operation_token as OPERATION_TOKEN
+from core.config import webhook_secret as WEBHOOK_SECRET
+
+_ids = itertools.count(1)
+
+
+def statement_item(amount: int, comment: str | None = None, **fields) -> dict:
+    item = {
+        "id": f"fake-{next(_ids)}",
+        "time": int(time.time()) + 1,
+        "description": "Поповнення банки",
+        "amount": amount,
+        "comment": comment,
+    }
+    item.update(fields)
+    return item
+
+
+def send_webhook(client, payload: dict, secret: str = WEBHOOK_SECRET):
+    """Фейковий відправник Monobank"""
+    return client.post("/payment/webhook", params={"secret": secret}, json=payload)
+
+
+def statement_event(account: str, item: dict) -> dict:
+    return {"type": "StatementItem", "data": {"account": account, "statementItem": item}}
+
+
+def test_webhook_url_check(client):
+    response = client.get("/payment/webhook", params={"secret": WEBHOOK_SECRET})
+    assert response.status_code == 200
+
+
+def test_webhook_rejects_wrong_secret(client):
+    response = send_webhook(
+        client, statement_event("jar-a", statement_item(100)), secret="wrong"
+    )
+    assert response.status_code == 401
+
+
+def test_webhook_ignores_other_event_types(client):
+    response = send_webhook(client, {"type": "Other", "data": {}})
+    assert response.status_code == 200
+    assert response.json() == {"status": "ignored"}
+
+
+def test_webhook_ignores_withdrawals(client):
+    response = send_webhook(client, statement_event("jar-a", statement_item(-500)))
+    assert response.status_code == 200
+    assert response.json() == {"status": "ignored"}
+
+
+def test_webhook_rejects_malformed_statement_item(client):
+    response = send_webhook(client, {"type": "StatementItem", "data": {}})
+    assert response.status_code == 422
+
+
+def test_webhook_ingests_once(client):
+    event = statement_event("jar-a", statement_item(1500, "без замовлення"))
+
+    first = send_webhook(client, event)
+    assert first.status_code == 200
+    assert first.json()["status"] == "ingested"
+    assert first.json()["order_id"] is None
+
+    repeated = send_webhook(client, event)
+    assert repeated.json() == {"status": "duplicate"}
+
+
+def test_webhook_pays_open_order(client):
+    headers = {"X-Operation-Token": OPERATION_TOKEN}
+    order = client.post(
+        "/order/create",
+        params={"jar_id": "jar-b", "amount": 2500, "comment": "order webhook"},
+        headers=headers,
+    ).json()
+
+    response = send_webhook(
+        client, statement_event("jar-b", statement_item(2500, "order webhook"))
+    )
+    assert response.json()["status"] == "ingested"
+    assert response.json()["order_id"] == order["id"]
+
+    stored = client.get(
+        "/order/get/by-id", params={"order_id": order["id"]}, headers=headers
+    ).json()
+    assert stored["status"] == "paid"
+
+
+def test_webhook_register_builds_url_with_secret(client, monkeypatch):
+    from api_v1.payment import views
+
+    registered = {}
+
+    async def fake_register_webhook(token: str, url: str):
+        registered["url"] = url
+        return {"webhook_url": url}
+
+    monkeypatch.setattr(views, "register_webhook", fake_register_webhook)
+    response = client.post(
+        "/payment/webhook/register",
+        params={"webhook_url": "https://example.com/hook?source=mono"},
+        headers={"X-Operation-Token": OPERATION_TOKEN, "monobank-token": "token"},
+    )
+    assert response.status_code == 200
+    assert registered["url"] == (
+        f"https://example.com/hook?source=mono&secret={WEBHOOK_SECRET}"
+    )
+
+
+def test_confirm_batch_reports_payment_of_already_paid_order(client):
+    headers = {"X-Operation-Token": OPERATION_TOKEN}
+    order = client.post(
+        "/order/create",
+        params={"jar_id": "jar-c", "amount": 3000, "comment": "order batch"},
+        headers=headers,
+    ).json()
+    ingested = send_webhook(
+        client, statement_event("jar-c", statement_item(3000, "order batch"))
+    ).json()
+    assert ingested["order_id"] == order["id"]
+
+    results = client.post(
+        "/order/confirm/batch", json={"order_ids": [order["id"]]}, headers=headers
+    ).json()
+    assert results == [
+        {
+            "order_id": order["id"],
+            "result": "already_paid",
+            "status": "paid",
+            "payment_id": ingested["payment_id"],
+        }
+    ]